@@ -1,88 +1,95 @@
 """Application business logic separated from GUI."""
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Callable
 
-from PySide6.QtCore import QThread, Signal
+from PySide6.QtCore import QObject, Signal
 
 from .processor import ExcelToGoogleSheets
 from .config import BASE_DIR
 
 
-class WorkerThread(QThread):
-    """Background worker for processing tasks."""
+class WorkerTask(QObject):
+    """Background processing task run on the AppLogic worker thread."""
 
     progress_update = Signal(int, int, str)
     log_message = Signal(str)
     finished_successfully = Signal()
     error_occurred = Signal(str)
 
-    def __init__(self, mode: str, **kwargs):
+    def __init__(self, mode: str, processor: ExcelToGoogleSheets, **kwargs):
         super().__init__()
         self.mode = mode
         self.kwargs = kwargs
-        self.processor: Optional[ExcelToGoogleSheets] = None
+        # Общий процессор AppLogic: авторизованный клиент gspread и
+        # credentials переиспользуются между запусками.
+        self.processor = processor
 
     def run(self):
+        # Сигналы Qt из рабочего потока доставляются в GUI через очередь
         try:
-            self.processor = ExcelToGoogleSheets(str(BASE_DIR / "config.yaml"))
-
-            if self.mode == "single":
-                excel_path = self.kwargs['excel_path']
-                google_sheet_url = self.kwargs['google_sheet_url']
-                config = self.kwargs['config']
-
-                self.processor.update_config(
-                    sheet_mapping=config['sheet_mapping'],
-                    column_mapping=config['column_mapping'],
-                    start_row=config['start_row']
-                )
-
-                self.log_message.emit("Подключение к Google Таблицам...")
-                self.processor.connect_to_google_sheets(google_sheet_url)
-
-                self.processor.process_excel_file(
-                    excel_path,
-                    progress_callback=self.progress_update.emit,
-                    log_callback=self.log_message.emit
-                )
-
-            elif self.mode == "batch":
-                file_mappings = self.kwargs['file_mappings']
-                google_sheet_url = self.kwargs['google_sheet_url']
-
-                self.processor.process_multiple_excel_files(
-                    file_mappings,
-                    google_sheet_url,
-                    progress_callback=self.progress_update.emit,
-                    log_callback=self.log_message.emit
-                )
-
-            elif self.mode == "download":
-                google_sheet_url = self.kwargs['google_sheet_url']
-                save_path = self.kwargs['save_path']
-                sheet_names = self.kwargs.get('sheet_names')
-
-                self.log_message.emit("Подключение к Google Таблицам...")
-                self.processor.connect_to_google_sheets(google_sheet_url)
-
-                self.processor.download_google_sheet(
-                    save_path,
-                    sheet_names=sheet_names,
-                    log_callback=self.log_message.emit
-                )
-
+            self._run_blocking()
             self.finished_successfully.emit()
-
         except Exception as e:  # pragma: no cover - defensive
             self.error_occurred.emit(str(e))
 
+    def _run_blocking(self):
+        if self.mode == "single":
+            excel_path = self.kwargs['excel_path']
+            google_sheet_url = self.kwargs['google_sheet_url']
+            config = self.kwargs['config']
+
+            self.processor.update_config(
+                sheet_mapping=config['sheet_mapping'],
+                column_mapping=config['column_mapping'],
+                start_row=config['start_row']
+            )
+
+            self.log_message.emit("Подключение к Google Таблицам...")
+            self.processor.connect_to_google_sheets(google_sheet_url)
+
+            self.processor.process_excel_file(
+                excel_path,
+                progress_callback=self.progress_update.emit,
+                log_callback=self.log_message.emit
+            )
+
+        elif self.mode == "batch":
+            file_mappings = self.kwargs['file_mappings']
+            google_sheet_url = self.kwargs['google_sheet_url']
+
+            self.processor.process_multiple_excel_files(
+                file_mappings,
+                google_sheet_url,
+                progress_callback=self.progress_update.emit,
+                log_callback=self.log_message.emit
+            )
+
+        elif self.mode == "download":
+            google_sheet_url = self.kwargs['google_sheet_url']
+            save_path = self.kwargs['save_path']
+            sheet_names = self.kwargs.get('sheet_names')
+
+            self.log_message.emit("Подключение к Google Таблицам...")
+            self.processor.connect_to_google_sheets(google_sheet_url)
+
+            self.processor.download_google_sheet(
+                save_path,
+                sheet_names=sheet_names,
+                log_callback=self.log_message.emit
+            )
+
 
 class AppLogic:
     """Facade for business logic used by GUI."""
 
     def __init__(self) -> None:
         self.processor = ExcelToGoogleSheets(str(BASE_DIR / "config.yaml"))
-        self.worker_thread: Optional[WorkerThread] = None
+        self.worker_task: Optional[WorkerTask] = None
+        # Один рабочий поток на все операции: поток не создается заново
+        # для каждого запуска, а операции с общим процессором не
+        # выполняются одновременно
+        self._executor: Optional[ThreadPoolExecutor] = None
 
     # Data retrieval helpers
     def get_excel_sheets(self, excel_path: str) -> List[str]:
@@ -106,14 +113,15 @@ class AppLogic:
         finished_cb: Callable[[], None],
         error_cb: Callable[[str], None],
     ) -> None:
-        self.worker_thread = WorkerThread(
+        self.worker_task = WorkerTask(
             mode="single",
+            processor=self.processor,
             excel_path=excel_path,
             google_sheet_url=google_url,
             config=config,
         )
         self._connect_worker_signals(progress_cb, log_cb, finished_cb, error_cb)
-        self.worker_thread.start()
+        self._submit(self.worker_task)
 
     def start_batch_processing(
         self,
@@ -124,13 +132,14 @@ class AppLogic:
         finished_cb: Callable[[], None],
         error_cb: Callable[[str], None],
     ) -> None:
-        self.worker_thread = WorkerThread(
+        self.worker_task = WorkerTask(
             mode="batch",
+            processor=self.processor,
             file_mappings=file_mappings,
             google_sheet_url=google_url,
         )
         self._connect_worker_signals(progress_cb, log_cb, finished_cb, error_cb)
-        self.worker_thread.start()
+        self._submit(self.worker_task)
 
     def start_download(
         self,
@@ -142,16 +151,28 @@ class AppLogic:
         finished_cb: Callable[[], None],
         error_cb: Callable[[str], None],
     ) -> None:
-        self.worker_thread = WorkerThread(
+        self.worker_task = WorkerTask(
             mode="download",
+            processor=self.processor,
             google_sheet_url=google_url,
             save_path=save_path,
             sheet_names=sheet_names,
         )
         self._connect_worker_signals(progress_cb, log_cb, finished_cb, error_cb)
-        self.worker_thread.start()
+        self._submit(self.worker_task)
+
+    def shutdown(self) -> None:
+        """Wait for the running task and stop the worker thread."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    # Internal helpers
+    def _submit(self, task: WorkerTask) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="copygoogle-worker")
+        self._executor.submit(task.run)
 
-    # Internal helper
     def _connect_worker_signals(
         self,
         progress_cb: Callable[[int, int, str], None],
@@ -159,10 +180,10 @@ class AppLogic:
         finished_cb: Callable[[], None],
         error_cb: Callable[[str], None],
     ) -> None:
-        if not self.worker_thread:
+        if not self.worker_task:
             return
-        self.worker_thread.progress_update.connect(progress_cb)
-        self.worker_thread.log_message.connect(log_cb)
-        self.worker_thread.finished_successfully.connect(finished_cb)
-        self.worker_thread.error_occurred.connect(error_cb)
+        self.worker_task.progress_update.connect(progress_cb)
+        self.worker_task.log_message.connect(log_cb)
+        self.worker_task.finished_successfully.connect(finished_cb)
+        self.worker_task.error_occurred.connect(error_cb)
 
@@ -1,14 +1,20 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
+import copy
 import yaml
 import os
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # libyaml не собран
+    from yaml import SafeLoader as _SafeLoader
+
 # Базовая директория проекта
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """Конфигурация приложения."""
     excel_path: str
@@ -19,9 +25,30 @@ class Config:
     start_row: int = 1
 
 
+# Кэш разобранных конфигураций: путь -> (mtime, Config)
+_CONFIG_CACHE: Dict[str, Tuple[float, Config]] = {}
+
+
+def _copy_config(config: Config) -> Config:
+    """Копия конфигурации, безопасная для изменения вызывающим кодом."""
+    return replace(
+        config,
+        sheet_mapping=copy.deepcopy(config.sheet_mapping),
+        column_mapping=copy.deepcopy(config.column_mapping),
+    )
+
+
 def load_config(config_path: str) -> Config:
-    """Загрузка конфигурации из YAML файла."""
-    if not os.path.exists(config_path):
+    """Загрузка конфигурации из YAML файла.
+
+    Результат кэшируется по времени изменения файла, поэтому повторные
+    вызовы для неизменённого файла не разбирают YAML заново.
+    """
+    config_path = str(config_path)
+    try:
+        f = open(config_path, 'rb')
+    except FileNotFoundError:
+        _CONFIG_CACHE.pop(config_path, None)
         return Config(
             excel_path='',
             google_sheet_id='',
@@ -31,10 +58,17 @@ def load_config(config_path: str) -> Config:
             start_row=1,
         )
 
-    with open(config_path, 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f) or {}
+    with f:
+        st_mtime = os.fstat(f.fileno()).st_mtime
+        cached = _CONFIG_CACHE.get(config_path)
+        if cached is not None and cached[0] == st_mtime:
+            return _copy_config(cached[1])
+        raw = f.read()
+
+    # libyaml разбирает цельный буфер байт быстрее, чем текстовый поток
+    data = yaml.load(raw, Loader=_SafeLoader) or {}
 
-    return Config(
+    config = Config(
         excel_path=data.get('excel_path', ''),
         google_sheet_id=data.get('google_sheet_id', ''),
         credentials_path=data.get('credentials_path', ''),
@@ -42,6 +76,8 @@ def load_config(config_path: str) -> Config:
         column_mapping=data.get('column_mapping', {'source': ['A'], 'target': ['A']}),
         start_row=data.get('start_row', 1),
     )
+    _CONFIG_CACHE[config_path] = (st_mtime, config)
+    return _copy_config(config)
 
 
 def create_sample_config(path: str | None = None) -> None:
@@ -1,10 +1,91 @@
 import json
+import os
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 
 from .config import BASE_DIR
 
+try:
+    import orjson
+except ImportError:  # orjson не установлен
+    orjson = None
+
 LINKS_FILE = BASE_DIR / 'saved_links.json'
+# Журнал добавленных ссылок поверх LINKS_FILE, по строке JSON [name, url]
+LINKS_LOG = BASE_DIR / 'saved_links.log'
+# После скольких записей журнал сливается в LINKS_FILE
+LOG_COMPACT_THRESHOLD = 100
+
+# Последнее прочитанное/записанное содержимое LINKS_FILE и его mtime
+_LINKS_CACHE: Optional[Dict[str, str]] = None
+_LINKS_MTIME: Optional[float] = None
+
+
+def _loads(raw: bytes):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode('utf-8'))
+
+
+def _dumps(links: Dict[str, str]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(links, option=orjson.OPT_INDENT_2)
+    return json.dumps(links, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _load_snapshot() -> Dict[str, str]:
+    global _LINKS_CACHE, _LINKS_MTIME
+
+    try:
+        mtime = LINKS_FILE.stat().st_mtime
+    except OSError:
+        return {}
+
+    if _LINKS_CACHE is not None and _LINKS_MTIME == mtime:
+        return dict(_LINKS_CACHE)
+
+    try:
+        with open(LINKS_FILE, 'rb') as f:
+            data = _loads(f.read())
+            if isinstance(data, dict):
+                _LINKS_CACHE = {str(k): str(v) for k, v in data.items()}
+                _LINKS_MTIME = mtime
+                return dict(_LINKS_CACHE)
+    except Exception:
+        pass
+    return {}
+
+
+def _load_log() -> List[Tuple[str, str]]:
+    try:
+        with open(LINKS_LOG, 'rb') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+
+    entries = []
+    for line in lines:
+        try:
+            name, url = _loads(line)
+        except Exception:
+            continue  # недописанная строка после сбоя
+        entries.append((str(name), str(url)))
+    return entries
+
+
+def _compact(links: Dict[str, str]) -> None:
+    """Write the merged links to LINKS_FILE and drop the log."""
+    global _LINKS_CACHE, _LINKS_MTIME
+
+    LINKS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = LINKS_FILE.with_suffix('.json.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(_dumps(links))
+    os.replace(tmp_path, LINKS_FILE)
+    LINKS_LOG.unlink(missing_ok=True)
+
+    _LINKS_CACHE = dict(links)
+    _LINKS_MTIME = LINKS_FILE.stat().st_mtime
 
 
 def load_links() -> Dict[str, str]:
@@ -13,21 +94,30 @@ def load_links() -> Dict[str, str]:
     Returns:
         dict: Mapping of name -> url.
     """
-    if LINKS_FILE.exists():
+    links = _load_snapshot()
+    entries = _load_log()
+    for name, url in entries:
+        links[name] = url
+
+    if len(entries) > LOG_COMPACT_THRESHOLD:
         try:
-            with open(LINKS_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if isinstance(data, dict):
-                    return {str(k): str(v) for k, v in data.items()}
-        except Exception:
+            _compact(links)
+        except OSError:
             pass
-    return {}
+    return links
 
 
 def save_link(name: str, url: str) -> None:
-    """Save a Google Sheet link under a user-defined name."""
-    links = load_links()
-    links[name] = url
-    LINKS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(LINKS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(links, f, ensure_ascii=False, indent=2)
+    """Save a Google Sheet link under a user-defined name.
+
+    The link is appended to ``LINKS_LOG``; ``load_links`` merges the log
+    into ``LINKS_FILE`` once it grows past ``LOG_COMPACT_THRESHOLD`` entries.
+    """
+    LINKS_LOG.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps([name, url], ensure_ascii=False).encode('utf-8') + b'\n'
+    with open(LINKS_LOG, 'a+b') as f:
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                line = b'\n' + line  # предыдущая запись была прервана
+        f.write(line)
@@ -1,9 +1,17 @@
 """Низкоуровневые утилиты для работы с таблицами."""
 
-from .sheet_utils import resolve_excel_columns, resolve_google_columns, copy_sheet_data
+from .sheet_utils import (
+    resolve_excel_columns,
+    resolve_google_columns,
+    build_sheet_payload,
+    apply_format_requests,
+    copy_sheet_data,
+)
 
 __all__ = [
     "resolve_excel_columns",
     "resolve_google_columns",
+    "build_sheet_payload",
+    "apply_format_requests",
     "copy_sheet_data",
 ]
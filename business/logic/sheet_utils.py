@@ -1,9 +1,22 @@
 from typing import List, Dict, Optional, Callable
 import logging
+import time
+import xml.etree.ElementTree as ET
 
-import gspread
+from openpyxl.cell.cell import Cell, MergedCell
+from openpyxl.cell.read_only import EmptyCell, ReadOnlyCell
 from openpyxl.utils import get_column_letter, column_index_from_string
-from openpyxl.styles import PatternFill, Font
+
+# Ячейки openpyxl, у которых формула хранится только в ``value``
+_OPENPYXL_CELL_TYPES = (Cell, MergedCell, ReadOnlyCell, EmptyCell)
+
+# Не больше стольких ячеек форматирования в одном запросе updateCells и в
+# одном вызове batch_update, чтобы тело запроса оставалось небольшим
+_FORMAT_BATCH_CELLS = 10000
+
+_SPREADSHEETML = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_ROW_TAG = _SPREADSHEETML + 'row'
+_SHEET_DATA_TAG = _SPREADSHEETML + 'sheetData'
 
 
 def resolve_excel_columns(sheet, columns: List[str]) -> List[str]:
@@ -236,8 +249,25 @@ def get_cell_formula_simple(cell):
     formula and normalises the result to a string starting with ``=``.  If a
     formula is detected but its text cannot be retrieved, a placeholder is
     returned so that the row is still considered to contain data.
+
+    Regular ``openpyxl`` cells keep the formula text in ``value`` and have
+    no other formula attributes, so they are resolved without the probing
+    loop; it is only used for other cell-like objects.
     """
 
+    if type(cell) in _OPENPYXL_CELL_TYPES:
+        data_type = getattr(cell, "data_type", None)
+        if data_type == "f":
+            value = cell.value
+            if isinstance(value, str) and value.startswith("="):
+                return value
+            return "=FORMULA_EXISTS_BUT_CANNOT_READ"
+        if data_type != "s":
+            # Числа, даты, ошибки и пустые ячейки формул не содержат
+            return None
+        value = cell.value
+        return value if isinstance(value, str) and value.startswith("=") else None
+
     for attr in ("value", "_value", "formula", "_formula"):
         val = getattr(cell, attr, None)
         if not val:
@@ -256,15 +286,160 @@ def get_cell_formula_simple(cell):
     return None
 
 
-def copy_sheet_data(
+def read_source_rows(excel_sheet, excel_sheet_values, source_cols: List[str], start_row: int):
+    """Read the source columns of a sheet in a single ``iter_rows`` pass.
+
+    Random ``sheet["A1"]`` access is quadratic for worksheets opened with
+    ``read_only=True``, so both the formula sheet and the optional values
+    sheet are streamed row by row instead.  Cells without formulas hold the
+    same value in both workbooks, so ``excel_sheet_values`` is only read
+    when the source columns actually contain formulas.
+
+    Returns a list of ``(row_number, cells, formulas, values)`` tuples where
+    ``cells`` are the cells of ``excel_sheet``, ``formulas`` the result of
+    ``get_cell_formula_simple`` for each of them and ``values`` the matching
+    values taken from ``excel_sheet_values`` (or from ``cells`` when it is
+    ``None``), all ordered like ``source_cols``.
+    """
+    if not source_cols:
+        return []
+
+    col_indexes = [column_index_from_string(col) for col in source_cols]
+    min_col = min(col_indexes)
+    max_col = max(col_indexes)
+    offsets = [idx - min_col for idx in col_indexes]
+
+    # The stored ``<dimension>`` of a read-only sheet may be stale and would
+    # cut ``iter_rows`` short, so the rows are read up to the real end
+    for sheet in (excel_sheet, excel_sheet_values):
+        reset_dimensions = getattr(sheet, 'reset_dimensions', None)
+        if reset_dimensions is not None:
+            reset_dimensions()
+
+    rows = []
+    has_formulas = False
+    formula_rows = excel_sheet.iter_rows(min_row=start_row, min_col=min_col, max_col=max_col)
+    for row_num, formula_row in enumerate(formula_rows, start=start_row):
+        cells = [formula_row[offset] for offset in offsets]
+        formulas = [get_cell_formula_simple(cell) for cell in cells]
+        if not has_formulas:
+            has_formulas = any(formula is not None for formula in formulas)
+        rows.append((row_num, cells, formulas, [cell.value for cell in cells]))
+
+    if excel_sheet_values is None or not has_formulas:
+        return rows
+
+    value_rows = excel_sheet_values.iter_rows(
+        min_row=start_row, min_col=min_col, max_col=max_col, values_only=True
+    )
+    for index, (row_num, cells, formulas, _values) in enumerate(rows):
+        value_row = next(value_rows, None) or ()
+        values = [value_row[offset] if offset < len(value_row) else None for offset in offsets]
+        rows[index] = (row_num, cells, formulas, values)
+    return rows
+
+
+def _hidden_rows(excel_sheet) -> set:
+    """Return the numbers of the hidden rows of ``excel_sheet``.
+
+    Worksheets opened with ``read_only=True`` have no ``row_dimensions``, so
+    the ``hidden`` attribute is read from the ``<row>`` elements of the sheet
+    XML instead.
+    """
+    row_dimensions = getattr(excel_sheet, 'row_dimensions', None)
+    if row_dimensions is not None:
+        return {row_num for row_num, dimension in row_dimensions.items() if dimension.hidden}
+
+    get_source = getattr(excel_sheet, '_get_source', None)
+    if get_source is None:
+        return set()
+
+    hidden = set()
+    row_num = 0
+    with get_source() as src:
+        for _event, element in ET.iterparse(src):
+            if element.tag == _ROW_TAG:
+                row_num = int(element.get('r', row_num + 1))
+                if element.get('hidden') in ('1', 'true'):
+                    hidden.add(row_num)
+                element.clear()
+            elif element.tag == _SHEET_DATA_TAG:
+                break
+    return hidden
+
+
+def build_format_requests(sheet_id: int, formats_to_apply: List[Dict]) -> List[Dict]:
+    """Group per-cell formats into rectangular ``updateCells`` requests.
+
+    ``formats_to_apply`` holds ``{'row', 'col', 'format'}`` dicts (1-based)
+    ordered by row.  Adjacent formatted cells of a row form one run, and runs
+    covering the same columns in consecutive rows are merged into one block.
+    Cells without formatting are never part of a block, so their existing
+    Google Sheets format is left untouched.  A block holds at most
+    ``_FORMAT_BATCH_CELLS`` cells.
+    """
+    # строка -> {колонка: формат}; при повторе колонки побеждает последний формат
+    rows: Dict[int, Dict[int, Dict]] = {}
+    for format_data in formats_to_apply:
+        rows.setdefault(format_data['row'], {})[format_data['col']] = format_data['format']
+
+    blocks = []
+    # (первая, последняя колонка) -> последний блок с этими колонками
+    open_blocks: Dict[tuple, Dict] = {}
+    for row, cells in rows.items():
+        runs = []
+        for col in sorted(cells):
+            if runs and runs[-1][1] == col - 1:
+                runs[-1][1] = col
+                runs[-1][2].append(cells[col])
+            else:
+                runs.append([col, col, [cells[col]]])
+
+        for first_col, last_col, formats in runs:
+            block = open_blocks.get((first_col, last_col))
+            if (block is None or block['last_row'] != row - 1
+                    or (len(block['rows']) + 1) * len(formats) > _FORMAT_BATCH_CELLS):
+                block = {'first_row': row, 'last_row': row, 'first_col': first_col,
+                         'last_col': last_col, 'rows': []}
+                blocks.append(block)
+                open_blocks[(first_col, last_col)] = block
+            block['last_row'] = row
+            block['rows'].append({'values': [{'userEnteredFormat': fmt} for fmt in formats]})
+
+    return [
+        {
+            'updateCells': {
+                'range': {
+                    'sheetId': sheet_id,
+                    'startRowIndex': block['first_row'] - 1,
+                    'endRowIndex': block['last_row'],
+                    'startColumnIndex': block['first_col'] - 1,
+                    'endColumnIndex': block['last_col']
+                },
+                'rows': block['rows'],
+                'fields': 'userEnteredFormat'
+            }
+        }
+        for block in blocks
+    ]
+
+
+def build_sheet_payload(
         excel_sheet,
         google_worksheet,
         column_mapping: Dict[str, List[str]],
         start_row: int,
         log_callback: Optional[Callable[[str], None]] = None,
         excel_sheet_values=None
-) -> int:
-    """Copy data from an Excel sheet to a Google worksheet.
+) -> Optional[Dict]:
+    """Prepare the data of an Excel sheet for writing to a Google worksheet.
+
+    Nothing is written to Google Sheets; the caller decides how to send the
+    result (a single ``worksheet.update`` or one ``values_batch_update`` for
+    several worksheets).  Returns ``None`` when there is nothing to write,
+    otherwise a dict with the A1 ``range`` (without sheet name), the
+    ``values`` matrix, the ``format_requests`` for ``spreadsheet.batch_update``,
+    the number of copied ``rows`` and target ``columns``.
 
     Parameters
     ----------
@@ -294,30 +469,27 @@ def copy_sheet_data(
     if len(source_cols) != len(target_cols):
         raise ValueError("Количество исходных и целевых колонок должно совпадать")
 
-    max_row = excel_sheet.max_row
+    source_rows = read_source_rows(excel_sheet, excel_sheet_values, source_cols, start_row)
+    max_row = start_row + len(source_rows) - 1
 
     # Определяем последнюю строку, содержащую данные или формулы,
     # чтобы не обрабатывать длинный хвост пустых строк.
     last_data_row = start_row - 1
-    values_sheet = excel_sheet_values if excel_sheet_values is not None else excel_sheet
-    for row in range(max_row, start_row - 1, -1):
+    for row_num, _cells, formulas, values in reversed(source_rows):
         row_has_data = False
-        for col_letter in source_cols:
-            formula_cell = excel_sheet[f"{col_letter}{row}"]
-            cell_formula = get_cell_formula_simple(formula_cell)
-            value_cell = values_sheet[f"{col_letter}{row}"]
-            cell_value = value_cell.value
+        for cell_formula, cell_value in zip(formulas, values):
             if cell_formula is not None or (cell_value is not None and str(cell_value).strip() != ""):
                 row_has_data = True
                 break
         if row_has_data:
-            last_data_row = row
+            last_data_row = row_num
             break
 
     if last_data_row > 0 and last_data_row < max_row:
         if log_callback:
             log_callback(f"🧹 Пропущено {max_row - last_data_row} пустых строк в конце листа")
         max_row = last_data_row
+        source_rows = source_rows[:max_row - start_row + 1]
 
     if log_callback:
         log_callback("Анализ видимых строк и данных Excel...")
@@ -327,13 +499,12 @@ def copy_sheet_data(
 
         # Быстрая проверка на наличие формул
         formulas_found = 0
-        for row in range(start_row, min(start_row + 50, max_row + 1)):
-            for col_letter in source_cols[:3]:  # Проверяем первые 3 колонки
-                formula_cell = excel_sheet[f"{col_letter}{row}"]
-                if hasattr(formula_cell, 'data_type') and formula_cell.data_type == 'f':
+        for row_num, cells, _formulas, _values in source_rows[:50]:
+            for col_letter, formula_cell in zip(source_cols[:3], cells):  # Проверяем первые 3 колонки
+                if getattr(formula_cell, 'data_type', None) == 'f':
                     formulas_found += 1
                     if formulas_found == 1:
-                        log_callback(f"🔍 Найдена ячейка с типом 'f' в {col_letter}{row}")
+                        log_callback(f"🔍 Найдена ячейка с типом 'f' в {col_letter}{row_num}")
                         log_callback(f"   value: {repr(formula_cell.value)}")
                         if hasattr(formula_cell, '_value'):
                             log_callback(f"   _value: {repr(formula_cell._value)}")
@@ -344,36 +515,21 @@ def copy_sheet_data(
     if max_row < start_row:
         if log_callback:
             log_callback("Нет данных для копирования")
-        return 0
+        return None
 
     rows_data = []
     skipped_rows = []  # Для отчета о пропущенных строках
     rows_with_values = 0
     missing_formula_cache = 0
 
-    for row_num in range(start_row, max_row + 1):
-        row_dimension = excel_sheet.row_dimensions.get(row_num)
-        is_hidden = bool(row_dimension and row_dimension.hidden)
-
+    for row_num, cells, formulas, values in source_rows:
         has_data = False
         row_cells = []
 
-        for col_letter in source_cols:
-            # Always take cells from the ``data_only=False`` sheet so that
-            # formula objects are available.
-            formula_cell = excel_sheet[f"{col_letter}{row_num}"]
-
-            # Получаем формулу
-            cell_formula = get_cell_formula_simple(formula_cell)
-
-            # Получаем значение ячейки (может быть из ``data_only=True`` книги)
-            if excel_sheet_values is not None:
-                value_cell = excel_sheet_values[f"{col_letter}{row_num}"]
-                cell_value = value_cell.value
-                if cell_formula is not None and cell_value is None:
-                    missing_formula_cache += 1
-            else:
-                cell_value = formula_cell.value
+        for col_letter, formula_cell, cell_formula, cell_value in zip(source_cols, cells, formulas, values):
+            # Значение ячейки (может быть из ``data_only=True`` книги)
+            if excel_sheet_values is not None and cell_formula is not None and cell_value is None:
+                missing_formula_cache += 1
 
             # Проверяем есть ли РЕАЛЬНЫЕ данные (не пустые ячейки)
             if cell_formula is not None:
@@ -393,13 +549,15 @@ def copy_sheet_data(
             rows_with_values += 1
             rows_data.append(row_cells)
         else:
-            reason = "скрытая строка" if is_hidden else "нет данных"
-            skipped_rows.append((row_num, reason))
+            skipped_rows.append(row_num)
 
-    # Выводим информацию о пропущенных строках
+    # Выводим информацию о пропущенных строках; скрытые строки ищутся
+    # только для отчета, чтобы не разбирать лист лишний раз
     if skipped_rows and log_callback:
+        hidden_rows = _hidden_rows(excel_sheet)
         log_callback(f"⚠️ Пропущено строк: {len(skipped_rows)}")
-        for row_num, reason in skipped_rows[:10]:  # Показываем первые 10
+        for row_num in skipped_rows[:10]:  # Показываем первые 10
+            reason = "скрытая строка" if row_num in hidden_rows else "нет данных"
             log_callback(f"  - Строка {row_num}: {reason}")
         if len(skipped_rows) > 10:
             log_callback(f"  ... и еще {len(skipped_rows) - 10} строк")
@@ -461,110 +619,155 @@ def copy_sheet_data(
     if not values_to_update:
         if log_callback:
             log_callback("Нет данных для записи в Google Sheets")
-        return 0
+        return None
 
     if log_callback:
         log_callback(f"Подготовлено {len(values_to_update)} строк для записи")
-        log_callback("Запись данных в Google Sheets...")
+
+    col_numbers = [column_index_from_string(col) for col in target_cols]
+    min_col = min(col_numbers)
+    max_col = max(col_numbers)
+    start_col_letter = get_column_letter(min_col)
+    end_col_letter = get_column_letter(max_col)
+    end_row = start_row + len(values_to_update) - 1
+    target_range = f"{start_col_letter}{start_row}:{end_col_letter}{end_row}"
+
+    num_cols = max_col - min_col + 1
+    index_map = [column_index_from_string(col) - min_col for col in target_cols]
+
+    formatted_values = []
+    for row in values_to_update:
+        row_values = [''] * num_cols
+        for value, idx in zip(row, index_map):
+            row_values[idx] = value if value is not None else ''
+        formatted_values.append(row_values)
+
+    format_requests = build_format_requests(google_worksheet.id, formats_to_apply)
+
+    return {
+        'range': target_range,
+        'values': formatted_values,
+        'format_requests': format_requests,
+        'rows': rows_with_values,
+        'columns': len(target_cols),
+    }
+
+
+def _request_cells(request: Dict) -> int:
+    """Number of cells covered by an ``updateCells`` request."""
+    cell_range = request['updateCells']['range']
+    return ((cell_range['endRowIndex'] - cell_range['startRowIndex'])
+            * (cell_range['endColumnIndex'] - cell_range['startColumnIndex']))
+
+
+def apply_format_requests(
+        spreadsheet,
+        format_requests: List[Dict],
+        log_callback: Optional[Callable[[str], None]] = None
+) -> None:
+    """Send ``updateCells`` formatting requests in batches.
+
+    A batch holds up to 500 requests and up to ``_FORMAT_BATCH_CELLS``
+    cells.  Formatting is best effort: quota errors stop the remaining
+    batches and any other failure is reported through ``log_callback`` only.
+    """
+    if not format_requests:
+        return
+
+    if log_callback:
+        log_callback(f"Применение форматирования к {len(format_requests)} диапазонам ячеек...")
+
+    batch_size = 500  # Увеличено с 100
+    batches = []
+    batch: List[Dict] = []
+    batch_cells = 0
+    for request in format_requests:
+        cells = _request_cells(request)
+        if batch and (len(batch) >= batch_size or batch_cells + cells > _FORMAT_BATCH_CELLS):
+            batches.append(batch)
+            batch = []
+            batch_cells = 0
+        batch.append(request)
+        batch_cells += cells
+    if batch:
+        batches.append(batch)
 
     try:
-        col_numbers = [column_index_from_string(col) for col in target_cols]
-        min_col = min(col_numbers)
-        max_col = max(col_numbers)
-        start_col_letter = get_column_letter(min_col)
-        end_col_letter = get_column_letter(max_col)
-        end_row = start_row + len(values_to_update) - 1
-        target_range = f"{start_col_letter}{start_row}:{end_col_letter}{end_row}"
-
-        num_cols = max_col - min_col + 1
-        index_map = [column_index_from_string(col) - min_col for col in target_cols]
-
-        formatted_values = []
-        for row in values_to_update:
-            row_values = [''] * num_cols
-            for value, idx in zip(row, index_map):
-                row_values[idx] = value if value is not None else ''
-            formatted_values.append(row_values)
+        for i, batch in enumerate(batches):
+            try:
+                spreadsheet.batch_update({
+                    'requests': batch
+                })
+
+                if log_callback:
+                    log_callback(f"Применено форматирование к {len(batch)} диапазонам ячеек")
+
+                if i + 1 < len(batches):
+                    time.sleep(1)  # 1 секунда между батчами
+
+            except Exception as batch_error:
+                if "Quota exceeded" in str(batch_error):
+                    if log_callback:
+                        log_callback("⚠️ Достигнут лимит API, пропускаем оставшееся форматирование")
+                    break
+                else:
+                    raise batch_error
+
+    except Exception as e:
+        if log_callback:
+            log_callback(f"Предупреждение: не удалось применить все форматирование - {str(e)}")
+
+
+def copy_sheet_data(
+        excel_sheet,
+        google_worksheet,
+        column_mapping: Dict[str, List[str]],
+        start_row: int,
+        log_callback: Optional[Callable[[str], None]] = None,
+        excel_sheet_values=None
+) -> int:
+    """Copy data from an Excel sheet to a Google worksheet.
+
+    Builds the payload with :func:`build_sheet_payload` and writes it to
+    ``google_worksheet`` with a single range update followed by the
+    formatting requests.
+    """
+    payload = build_sheet_payload(
+        excel_sheet,
+        google_worksheet,
+        column_mapping,
+        start_row,
+        log_callback,
+        excel_sheet_values=excel_sheet_values
+    )
+    if payload is None:
+        return 0
 
+    if log_callback:
+        log_callback("Запись данных в Google Sheets...")
+
+    try:
+        target_range = payload['range']
         if log_callback:
             log_callback(f"Обновление диапазона {target_range}...")
 
         google_worksheet.update(
             target_range,
-            formatted_values,
+            payload['values'],
             value_input_option='USER_ENTERED'
         )
 
         if log_callback:
             log_callback(f"✓ Данные записаны в диапазон {target_range}")
 
-        if formats_to_apply:
-            if log_callback:
-                log_callback(f"Применение форматирования к {len(formats_to_apply)} ячейкам...")
-
-            try:
-                format_requests = []
-
-                for format_data in formats_to_apply:
-                    row = format_data['row']
-                    col = format_data['col']
-                    cell_format = format_data['format']
-
-                    format_request = {
-                        'updateCells': {
-                            'range': {
-                                'sheetId': google_worksheet.id,
-                                'startRowIndex': row - 1,
-                                'endRowIndex': row,
-                                'startColumnIndex': col - 1,
-                                'endColumnIndex': col
-                            },
-                            'rows': [{
-                                'values': [{
-                                    'userEnteredFormat': cell_format
-                                }]
-                            }],
-                            'fields': 'userEnteredFormat'
-                        }
-                    }
-                    format_requests.append(format_request)
-
-                batch_size = 500  # Увеличено с 100
-                import time
-
-                for i in range(0, len(format_requests), batch_size):
-                    batch = format_requests[i:i + batch_size]
-                    if batch:
-                        try:
-                            google_worksheet.spreadsheet.batch_update({
-                                'requests': batch
-                            })
-
-                            if log_callback:
-                                log_callback(
-                                    f"Применено форматирование к {min(len(batch), len(format_requests) - i)} ячейкам")
-
-                            if i + batch_size < len(format_requests):
-                                time.sleep(1)  # 1 секунда между батчами
-
-                        except Exception as batch_error:
-                            if "Quota exceeded" in str(batch_error):
-                                if log_callback:
-                                    log_callback("⚠️ Достигнут лимит API, пропускаем оставшееся форматирование")
-                                break
-                            else:
-                                raise batch_error
-
-            except Exception as e:
-                if log_callback:
-                    log_callback(f"Предупреждение: не удалось применить все форматирование - {str(e)}")
+        apply_format_requests(google_worksheet.spreadsheet, payload['format_requests'], log_callback)
 
         if log_callback:
-            log_callback(f"✓ Успешно обновлено {len(values_to_update)} строк, {len(target_cols)} колонок")
-            if formats_to_apply:
-                log_callback(f"✓ Применено форматирование к {len(formats_to_apply)} ячейкам")
+            log_callback(f"✓ Успешно обновлено {len(payload['values'])} строк, {payload['columns']} колонок")
+            if payload['format_requests']:
+                log_callback(f"✓ Применено форматирование к {len(payload['format_requests'])} диапазонам ячеек")
 
-        return rows_with_values
+        return payload['rows']
 
     except Exception as e:
         if log_callback:
@@ -1,19 +1,283 @@
 import logging
 import os
+import posixpath
+import random
+import re
 from pathlib import Path
-from typing import Dict, List, Optional, Callable
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Callable, Tuple
 import tempfile
 import shutil
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import fields
 
-import gspread
-import openpyxl
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload
-import io
+# gspread, openpyxl и клиенты Google API импортируются при первом
+# использовании, чтобы не замедлять запуск GUI.
+if TYPE_CHECKING:
+    import gspread
 
 from .config import Config, load_config, BASE_DIR
-from .logic.sheet_utils import copy_sheet_data, clear_column_cache
+from .logic.sheet_utils import apply_format_requests, build_sheet_payload, clear_column_cache
+
+_SHEET_ID_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'/spreadsheets/d/([a-zA-Z0-9-_]+)',
+    r'id=([a-zA-Z0-9-_]+)',
+    r'^([a-zA-Z0-9-_]+)$',
+))
+_CONFIG_KEYS = frozenset(field.name for field in fields(Config))
+_SPREADSHEETML_NS = {'m': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+_SHEET_TAG = '{%s}sheet' % _SPREADSHEETML_NS['m']
+_SHEETS_TAG = '{%s}sheets' % _SPREADSHEETML_NS['m']
+
+_LOGGER = logging.getLogger(__name__)
+_LOGGER.setLevel(logging.INFO)
+if not _LOGGER.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    _LOGGER.addHandler(_handler)
+
+# Коды ответа Google API, после которых запрос имеет смысл повторить
+_RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+_RETRY_ATTEMPTS = 6
+_RETRY_MAX_DELAY = 60
+
+# Размер чанка при экспорте таблицы из Google Drive (по умолчанию 100 КБ)
+_DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Сколько Excel файлов пакета загружается заранее в фоновых потоках
+_LOADER_WORKERS = 4
+
+# Не больше стольких ячеек в одном values_batch_update, чтобы тело запроса
+# оставалось небольшим
+_WRITE_BATCH_CELLS = 50000
+
+
+def _error_status(error: Exception) -> Optional[int]:
+    """HTTP статус ошибки gspread (``APIError``) или googleapiclient (``HttpError``)."""
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'resp', None), 'status', None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_retryable(error: Exception) -> bool:
+    import gspread
+    import requests
+    from googleapiclient.errors import HttpError
+
+    if isinstance(error, (gspread.exceptions.APIError, HttpError)):
+        return _error_status(error) in _RETRYABLE_STATUS_CODES
+    return isinstance(error, (ConnectionError, TimeoutError, requests.exceptions.ConnectionError,
+                              requests.exceptions.Timeout))
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """Пауза перед повтором: Retry-After из ответа или 2^attempt со случайной добавкой."""
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or getattr(error, 'resp', None) or {}
+    try:
+        retry_after = float(headers.get('retry-after') or headers.get('Retry-After'))
+    except (AttributeError, TypeError, ValueError):
+        retry_after = None
+    if retry_after is not None and retry_after >= 0:
+        return min(retry_after, _RETRY_MAX_DELAY)
+    return min(2 ** attempt + random.random(), _RETRY_MAX_DELAY)
+
+
+def _retry(func: Callable, *args, **kwargs):
+    """Вызов Google API с повтором и экспоненциальной задержкой.
+
+    Повторяются только временные ошибки: превышение квоты (429), ошибки
+    сервера 5xx и сетевые сбои. Остальные исключения пробрасываются сразу.
+    Заголовок Retry-After, если сервер его прислал, имеет приоритет.
+    """
+    for attempt in range(_RETRY_ATTEMPTS):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if attempt == _RETRY_ATTEMPTS - 1 or not _is_retryable(e):
+                raise
+            time.sleep(_retry_delay(e, attempt))
+
+
+# Имена листов Excel файлов: путь -> (mtime, размер, имена листов)
+_EXCEL_SHEETS_CACHE: Dict[str, Tuple[float, int, Tuple[str, ...]]] = {}
+_EXCEL_SHEETS_CACHE_SIZE = 32
+
+# Credentials, клиент gspread и сервис Drive по пути к файлу сервисного
+# аккаунта: путь -> (mtime, credentials, client, drive_service)
+_GOOGLE_CLIENTS_CACHE: Dict[str, Tuple[float, Any, Any, Any]] = {}
+
+
+def _google_clients(credentials_path: str) -> Tuple[Any, Any, Any]:
+    """Авторизованные клиенты Google, общие для всех экземпляров процессора.
+
+    Файл ключа читается и разбирается заново только при изменении его mtime.
+    """
+    mtime = os.stat(credentials_path).st_mtime
+    cached = _GOOGLE_CLIENTS_CACHE.get(credentials_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1:]
+
+    import gspread
+    from google.oauth2.service_account import Credentials
+    from googleapiclient.discovery import build
+
+    scope = [
+        'https://spreadsheets.google.com/feeds',
+        'https://www.googleapis.com/auth/drive'
+    ]
+    creds = Credentials.from_service_account_file(credentials_path, scopes=scope)
+    client = _retry(gspread.authorize, creds)
+    drive_service = build('drive', 'v3', credentials=creds)
+    _GOOGLE_CLIENTS_CACHE[credentials_path] = (mtime, creds, client, drive_service)
+    return creds, client, drive_service
+
+
+_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+_PKG_RELS_NS = {'r': 'http://schemas.openxmlformats.org/package/2006/relationships'}
+_SHEET_TAG_RE = re.compile(r'<(?:\w+:)?sheet\b[^>]*/>')
+_DEFINED_NAME_RE = re.compile(
+    r'<(?:\w+:)?definedName\b[^>]*?(?:/>|>.*?</(?:\w+:)?definedName>)', re.DOTALL
+)
+_LOCAL_SHEET_ID_RE = re.compile(r'\blocalSheetId="(\d+)"')
+_BOOK_VIEW_INDEX_RE = re.compile(r'\b(activeTab|firstSheet)="(\d+)"')
+_RELATIONSHIP_RE = re.compile(r'<(?:\w+:)?Relationship\b[^>]*/>')
+_OVERRIDE_RE = re.compile(r'<(?:\w+:)?Override\b[^>]*/>')
+
+
+def _attr(tag: str, name: str) -> Optional[str]:
+    match = re.search(r'\b' + name + r'="([^"]*)"', tag)
+    return match.group(1) if match else None
+
+
+def _rels_path(part: str) -> str:
+    return posixpath.join(posixpath.dirname(part), '_rels', posixpath.basename(part) + '.rels')
+
+
+def _resolve_target(part: str, target: str) -> str:
+    """Имя части архива для ``Target`` связи из rels части ``part``."""
+    if target.startswith('/'):
+        return target.lstrip('/')
+    return posixpath.normpath(posixpath.join(posixpath.dirname(part), target))
+
+
+def _related_parts(archive: zipfile.ZipFile, names: set, starts: List[str], skip: set) -> set:
+    """Части архива, достижимые по rels из ``starts``, не заходя в ``skip``."""
+    found = set()
+    stack = list(starts)
+    while stack:
+        part = stack.pop()
+        rels = _rels_path(part)
+        if rels not in names:
+            continue
+        for rel in ET.fromstring(archive.read(rels)).findall('r:Relationship', _PKG_RELS_NS):
+            if rel.get('TargetMode') == 'External':
+                continue
+            target = _resolve_target(part, rel.get('Target', ''))
+            if target in names and target not in skip and target not in found:
+                found.add(target)
+                stack.append(target)
+    return found
+
+
+def _strip_xlsx_sheets(src_path: str, dst_path: str, keep: List[str]):
+    """Копия xlsx без листов, которых нет в ``keep``, без разбора ячеек.
+
+    Из архива выбрасываются XML лишних листов, calcChain.xml и части,
+    на которые ссылаются только лишние листы (рисунки, примечания и т.п.),
+    а в workbook.xml, его rels и [Content_Types].xml удаляются ссылки на
+    них. Остальные части копируются как есть. Для нестандартной структуры
+    книги выбрасывается ValueError.
+    """
+    with zipfile.ZipFile(src_path) as src:
+        workbook_xml = src.read('xl/workbook.xml').decode('utf-8')
+        rels_xml = src.read('xl/_rels/workbook.xml.rels').decode('utf-8')
+        content_types_xml = src.read('[Content_Types].xml').decode('utf-8')
+
+        sheets = ET.fromstring(workbook_xml).findall('m:sheets/m:sheet', _SPREADSHEETML_NS)
+        rels_root = ET.fromstring(rels_xml)
+        targets = {
+            rel.get('Id'): rel.get('Target', '')
+            for rel in rels_root.findall('r:Relationship', _PKG_RELS_NS)
+        }
+
+        sheet_tags = _SHEET_TAG_RE.findall(workbook_xml)
+        if len(sheet_tags) != len(sheets):
+            raise ValueError("Неожиданная структура xl/workbook.xml")
+
+        removed = [i for i, sheet in enumerate(sheets) if sheet.get('name') not in keep]
+        kept = [sheet for i, sheet in enumerate(sheets) if i not in removed]
+        if not kept or all(sheet.get('state') in ('hidden', 'veryHidden') for sheet in kept):
+            raise ValueError("В книге не остается видимых листов")
+
+        removed_ids = {sheets[i].get(_REL_NS) for i in removed}
+        removed_sheets = set()
+        for rel_id in removed_ids:
+            target = targets.get(rel_id)
+            if not target:
+                raise ValueError(f"Не найдена часть листа для {rel_id}")
+            removed_sheets.add(_resolve_target('xl/workbook.xml', target))
+        for rel in rels_root.findall('r:Relationship', _PKG_RELS_NS):
+            if rel.get('Type', '').endswith('/calcChain'):
+                removed_ids.add(rel.get('Id'))
+                removed_sheets.add(_resolve_target('xl/workbook.xml', rel.get('Target', '')))
+
+        # Части лишних листов удаляются, если до них нельзя дойти от корня
+        # пакета в обход этих листов
+        names = set(src.namelist())
+        owned = _related_parts(src, names, list(removed_sheets), set())
+        used = _related_parts(src, names, [''], removed_sheets)
+        removed_parts = removed_sheets | (owned - used)
+        removed_parts |= {_rels_path(part) for part in removed_parts}
+
+        def new_index(old: int) -> Optional[int]:
+            if old in removed:
+                return None
+            return old - sum(1 for i in removed if i < old)
+
+        for i in reversed(removed):
+            workbook_xml = workbook_xml.replace(sheet_tags[i], '', 1)
+
+        def fix_defined_name(match):
+            local = _LOCAL_SHEET_ID_RE.search(match.group(0))
+            if not local:
+                return match.group(0)
+            index = new_index(int(local.group(1)))
+            if index is None:
+                return ''
+            return _LOCAL_SHEET_ID_RE.sub(f'localSheetId="{index}"', match.group(0), count=1)
+
+        def fix_book_view(match):
+            index = new_index(int(match.group(2)))
+            return f'{match.group(1)}="{index or 0}"'
+
+        workbook_xml = _DEFINED_NAME_RE.sub(fix_defined_name, workbook_xml)
+        workbook_xml = _BOOK_VIEW_INDEX_RE.sub(fix_book_view, workbook_xml)
+        rels_xml = _RELATIONSHIP_RE.sub(
+            lambda m: '' if _attr(m.group(0), 'Id') in removed_ids else m.group(0), rels_xml
+        )
+        content_types_xml = _OVERRIDE_RE.sub(
+            lambda m: '' if (_attr(m.group(0), 'PartName') or '').lstrip('/') in removed_parts else m.group(0),
+            content_types_xml
+        )
+
+        replaced = {
+            'xl/workbook.xml': workbook_xml.encode('utf-8'),
+            'xl/_rels/workbook.xml.rels': rels_xml.encode('utf-8'),
+            '[Content_Types].xml': content_types_xml.encode('utf-8'),
+        }
+        with zipfile.ZipFile(dst_path, 'w', zipfile.ZIP_DEFLATED) as dst:
+            for info in src.infolist():
+                if info.filename in removed_parts:
+                    continue
+                data = replaced.get(info.filename)
+                dst.writestr(info, data if data is not None else src.read(info))
 
 
 class ExcelToGoogleSheets:
@@ -25,32 +289,18 @@ class ExcelToGoogleSheets:
             path = BASE_DIR / path
         self.config_path = str(path)
         self.config = load_config(self.config_path)
-        self.logger = self._setup_logger()
+        self.logger = _LOGGER
         self.gc = None
         self.google_sheet = None
         self._google_creds = None
         self._drive_service = None
-
-    def _setup_logger(self) -> logging.Logger:
-        logger = logging.getLogger(__name__)
-        logger.setLevel(logging.INFO)
-        if not logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-            handler.setFormatter(formatter)
-            logger.addHandler(handler)
-        return logger
+        # Открытые таблицы по ID, чтобы не повторять open_by_key
+        self._sheet_cache: Dict[str, 'gspread.Spreadsheet'] = {}
 
     def extract_sheet_id_from_url(self, url: str) -> str:
         """Извлечение ID таблицы из URL Google Sheets."""
-        import re
-        patterns = [
-            r'/spreadsheets/d/([a-zA-Z0-9-_]+)',
-            r'id=([a-zA-Z0-9-_]+)',
-            r'^([a-zA-Z0-9-_]+)$'
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, url)
+        for pattern in _SHEET_ID_PATTERNS:
+            match = pattern.search(url)
             if match:
                 return match.group(1)
         raise ValueError(f"Не удалось извлечь ID таблицы из URL: {url}")
@@ -77,18 +327,16 @@ class ExcelToGoogleSheets:
             self.config.credentials_path = str(cred_path)
 
             if not self.gc:
-                scope = [
-                    'https://spreadsheets.google.com/feeds',
-                    'https://www.googleapis.com/auth/drive'
-                ]
-                self._google_creds = Credentials.from_service_account_file(
-                    self.config.credentials_path,
-                    scopes=scope
+                self._google_creds, self.gc, self._drive_service = _google_clients(
+                    self.config.credentials_path
                 )
-                self.gc = gspread.authorize(self._google_creds)
-                self._drive_service = build('drive', 'v3', credentials=self._google_creds)
+                self._sheet_cache.clear()
 
-            self.google_sheet = self.gc.open_by_key(sheet_id)
+            google_sheet = self._sheet_cache.get(sheet_id)
+            if google_sheet is None:
+                google_sheet = _retry(self.gc.open_by_key, sheet_id)
+                self._sheet_cache[sheet_id] = google_sheet
+            self.google_sheet = google_sheet
             self.logger.info(f"Успешное подключение к Google Таблице: {sheet_id}")
         except Exception as e:
             self.logger.error(f"Ошибка подключения к Google Таблицам: {e}")
@@ -96,12 +344,47 @@ class ExcelToGoogleSheets:
 
     def update_config(self, **kwargs):
         for key, value in kwargs.items():
-            if hasattr(self.config, key):
+            if key in _CONFIG_KEYS:
                 setattr(self.config, key, value)
 
     def get_excel_sheets(self, excel_path: str) -> List[str]:
         try:
-            wb = openpyxl.load_workbook(excel_path, data_only=False, keep_vba=True, read_only=False)
+            stat = os.stat(excel_path)
+        except OSError:
+            stat = None
+        else:
+            cached = _EXCEL_SHEETS_CACHE.get(excel_path)
+            if cached is not None and cached[:2] == (stat.st_mtime, stat.st_size):
+                return list(cached[2])
+
+        sheets = self._read_excel_sheets(excel_path)
+        if stat is not None and sheets:
+            _EXCEL_SHEETS_CACHE.pop(excel_path, None)
+            if len(_EXCEL_SHEETS_CACHE) >= _EXCEL_SHEETS_CACHE_SIZE:
+                _EXCEL_SHEETS_CACHE.pop(next(iter(_EXCEL_SHEETS_CACHE)))
+            _EXCEL_SHEETS_CACHE[excel_path] = (stat.st_mtime, stat.st_size, tuple(sheets))
+        return sheets
+
+    def _read_excel_sheets(self, excel_path: str) -> List[str]:
+        # Для .xlsx достаточно прочитать xl/workbook.xml, не разбирая листы
+        try:
+            sheets = []
+            with zipfile.ZipFile(excel_path) as archive:
+                with archive.open('xl/workbook.xml') as f:
+                    # Разбор останавливается на </sheets>: definedNames,
+                    # calcPr и прочее дальше не читаются
+                    for _event, element in ET.iterparse(f):
+                        if element.tag == _SHEET_TAG:
+                            sheets.append(element.get('name'))
+                        elif element.tag == _SHEETS_TAG:
+                            return sheets
+        except Exception:
+            pass
+
+        try:
+            import openpyxl
+
+            wb = openpyxl.load_workbook(excel_path, read_only=True, keep_vba=False, keep_links=False)
             sheets = wb.sheetnames
             wb.close()
             return sheets
@@ -113,7 +396,15 @@ class ExcelToGoogleSheets:
         try:
             if not self.google_sheet:
                 return []
-            return [sheet.title for sheet in self.google_sheet.worksheets()]
+            # Запрашиваем только названия листов, без свойств сетки и форматов
+            metadata = _retry(
+                self.google_sheet.fetch_sheet_metadata,
+                params={'fields': 'sheets.properties.title'}
+            )
+            try:
+                return [sheet['properties']['title'] for sheet in metadata['sheets']]
+            except KeyError:
+                return [sheet.title for sheet in _retry(self.google_sheet.worksheets)]
         except Exception as e:
             self.logger.error(f"Ошибка получения списка Google листов: {e}")
             return []
@@ -129,49 +420,31 @@ class ExcelToGoogleSheets:
             file_id = self.google_sheet.id
 
             if sheet_names:
-                with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp_file:
-                    request = self._drive_service.files().export_media(
-                        fileId=file_id,
-                        mimeType='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-                    )
-
-                    fh = io.BytesIO()
-                    downloader = MediaIoBaseDownload(fh, request)
-                    done = False
-                    while not done:
-                        status, done = downloader.next_chunk()
-                        if status:
-                            self._log(f"Скачивание: {int(status.progress() * 100)}%", log_callback)
-
-                    fh.seek(0)
-                    tmp_file.write(fh.read())
-                    tmp_file_path = tmp_file.name
-
-                wb = openpyxl.load_workbook(tmp_file_path)
-                sheets_to_remove = [sheet for sheet in wb.sheetnames if sheet not in sheet_names]
-                for sheet_name in sheets_to_remove:
-                    wb.remove(wb[sheet_name])
+                tmp_fd, tmp_file_path = tempfile.mkstemp(suffix='.xlsx')
+                os.close(tmp_fd)
+                try:
+                    self._export_xlsx(file_id, tmp_file_path, log_callback)
 
-                wb.save(save_path)
-                wb.close()
-                os.unlink(tmp_file_path)
+                    try:
+                        _strip_xlsx_sheets(tmp_file_path, save_path, sheet_names)
+                    except (KeyError, ValueError, zipfile.BadZipFile, ET.ParseError) as e:
+                        # Нестандартная книга: удаляем листы через openpyxl
+                        import openpyxl
+
+                        self.logger.warning(f"Удаление листов на уровне архива не удалось: {e}")
+                        wb = openpyxl.load_workbook(tmp_file_path)
+                        sheets_to_remove = [sheet for sheet in wb.sheetnames if sheet not in sheet_names]
+                        for sheet_name in sheets_to_remove:
+                            wb.remove(wb[sheet_name])
+
+                        wb.save(save_path)
+                        wb.close()
+                finally:
+                    os.unlink(tmp_file_path)
 
                 self._log(f"✓ Скачаны листы: {', '.join(sheet_names)}", log_callback)
             else:
-                request = self._drive_service.files().export_media(
-                    fileId=file_id,
-                    mimeType='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-                )
-
-                fh = io.FileIO(save_path, 'wb')
-                downloader = MediaIoBaseDownload(fh, request)
-                done = False
-                while not done:
-                    status, done = downloader.next_chunk()
-                    if status:
-                        self._log(f"Скачивание: {int(status.progress() * 100)}%", log_callback)
-
-                fh.close()
+                self._export_xlsx(file_id, save_path, log_callback)
                 self._log("✓ Скачана полная таблица", log_callback)
 
             self._log(f"💾 Сохранено: {save_path}", log_callback)
@@ -181,6 +454,25 @@ class ExcelToGoogleSheets:
             self._log(f"❌ Ошибка скачивания: {e}", log_callback)
             raise
 
+    def _export_xlsx(self, file_id: str, path: str,
+                     log_callback: Optional[Callable[[str], None]] = None):
+        """Экспорт Google таблицы в xlsx с записью чанков прямо в файл."""
+        from googleapiclient.http import MediaIoBaseDownload
+
+        request = self._drive_service.files().export_media(
+            fileId=file_id,
+            mimeType='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        )
+
+        with open(path, 'wb') as fh:
+            downloader = MediaIoBaseDownload(fh, request, chunksize=_DOWNLOAD_CHUNK_SIZE)
+            done = False
+            while not done:
+                # googleapiclient сам повторяет чанк при 429/5xx с backoff
+                status, done = downloader.next_chunk(num_retries=_RETRY_ATTEMPTS)
+                if status:
+                    self._log(f"Скачивание: {int(status.progress() * 100)}%", log_callback)
+
     def process_excel_file(
             self,
             excel_path: str,
@@ -191,74 +483,102 @@ class ExcelToGoogleSheets:
             if not os.path.exists(excel_path):
                 raise FileNotFoundError(f"Excel файл не найден: {excel_path}")
 
+            from gspread.utils import absolute_range_name
+
             clear_column_cache()
 
             self._log("Загрузка Excel файла...", log_callback)
-            wb_formulas = openpyxl.load_workbook(excel_path, data_only=False)
-            wb_values = openpyxl.load_workbook(excel_path, data_only=True)
-            self._log(
-                "Примечание: openpyxl не вычисляет формулы. Значения берутся из последнего сохранения файла.",
-                log_callback
-            )
+            wb_formulas, wb_values = self._load_workbooks(excel_path)
+            # Книги read_only держат файл открытым до close()
+            try:
+                self._log(
+                    "Примечание: openpyxl не вычисляет формулы. Значения берутся из последнего сохранения файла.",
+                    log_callback
+                )
 
-            total_sheets = len(self.config.sheet_mapping)
-            processed_sheets = 0
+                total_sheets = len(self.config.sheet_mapping)
+                processed_sheets = 0
+                worksheets = self._worksheets_by_title()
+                formula_names = set(wb_formulas.sheetnames)
+                value_names = set(wb_values.sheetnames)
 
-            for excel_sheet_name, google_sheet_name in self.config.sheet_mapping.items():
-                try:
-                    self._log(f"Начало обработки листа: {excel_sheet_name}", log_callback)
+                # Данные листов отправляются общими values_batch_update
+                batched_data = []
+                batched_formats = []
+                prepared_sheets = []
+
+                for excel_sheet_name, google_sheet_name in self.config.sheet_mapping.items():
+                    try:
+                        self._log(f"Начало обработки листа: {excel_sheet_name}", log_callback)
+
+                        if excel_sheet_name not in formula_names:
+                            self._log(f"⚠️ Лист '{excel_sheet_name}' не найден в Excel файле", log_callback)
+                            processed_sheets += 1
+                            if progress_callback:
+                                progress_callback(processed_sheets, total_sheets, excel_sheet_name)
+                            continue
+                        excel_sheet = wb_formulas[excel_sheet_name]
+                        excel_sheet_values = None
+                        if excel_sheet_name in value_names:
+                            excel_sheet_values = wb_values[excel_sheet_name]
+                        else:
+                            self._log(
+                                f"⚠️ Лист '{excel_sheet_name}' отсутствует в книге значений (data_only=True). Формулы будут вставлены без вычисленных значений",
+                                log_callback
+                            )
+
+                        google_worksheet = worksheets.get(google_sheet_name)
+                        if google_worksheet is None:
+                            self._log(f"⚠️ Лист '{google_sheet_name}' не найден в Google Таблицах", log_callback)
+                            processed_sheets += 1
+                            if progress_callback:
+                                progress_callback(processed_sheets, total_sheets, excel_sheet_name)
+                            continue
+
+                        payload = build_sheet_payload(
+                            excel_sheet,
+                            google_worksheet,
+                            self.config.column_mapping,
+                            self.config.start_row,
+                            log_callback,
+                            excel_sheet_values=excel_sheet_values
+                        )
+
+                        if payload is None:
+                            self._log(f"✓ Лист '{excel_sheet_name}' обработан. Скопировано строк: 0", log_callback)
+                        else:
+                            batched_data.append({
+                                'range': absolute_range_name(google_sheet_name, payload['range']),
+                                'values': payload['values'],
+                            })
+                            batched_formats.append(payload['format_requests'])
+                            prepared_sheets.append((excel_sheet_name, payload['rows']))
 
-                    if excel_sheet_name not in wb_formulas.sheetnames:
-                        self._log(f"⚠️ Лист '{excel_sheet_name}' не найден в Excel файле", log_callback)
                         processed_sheets += 1
                         if progress_callback:
                             progress_callback(processed_sheets, total_sheets, excel_sheet_name)
-                        continue
-                    excel_sheet = wb_formulas[excel_sheet_name]
-                    excel_sheet_values = None
-                    if excel_sheet_name in wb_values.sheetnames:
-                        excel_sheet_values = wb_values[excel_sheet_name]
-                    else:
-                        self._log(
-                            f"⚠️ Лист '{excel_sheet_name}' отсутствует в книге значений (data_only=True). Формулы будут вставлены без вычисленных значений",
-                            log_callback
-                        )
 
-                    try:
-                        google_worksheet = self.google_sheet.worksheet(google_sheet_name)
-                    except gspread.exceptions.WorksheetNotFound:
-                        self._log(f"⚠️ Лист '{google_sheet_name}' не найден в Google Таблицах", log_callback)
+                    except Exception as e:
+                        self._log(f"❌ Ошибка при обработке листа '{excel_sheet_name}': {e}", log_callback)
                         processed_sheets += 1
                         if progress_callback:
                             progress_callback(processed_sheets, total_sheets, excel_sheet_name)
-                        continue
+            finally:
+                wb_formulas.close()
+                wb_values.close()
 
-                    rows_copied = copy_sheet_data(
-                        excel_sheet,
-                        google_worksheet,
-                        self.config.column_mapping,
-                        self.config.start_row,
-                        log_callback,
-                        excel_sheet_values=excel_sheet_values
-                    )
+            if batched_data:
+                errors = self._write_batch(batched_data, batched_formats, log_callback)
 
+                for (excel_sheet_name, rows_copied), error in zip(prepared_sheets, errors):
+                    if error is not None:
+                        self._log(f"❌ Ошибка при обработке листа '{excel_sheet_name}': {error}", log_callback)
+                        continue
                     self._log(
                         f"✓ Лист '{excel_sheet_name}' обработан. Скопировано строк: {rows_copied}",
                         log_callback
                     )
 
-                    processed_sheets += 1
-                    if progress_callback:
-                        progress_callback(processed_sheets, total_sheets, excel_sheet_name)
-
-                except Exception as e:
-                    self._log(f"❌ Ошибка при обработке листа '{excel_sheet_name}': {e}", log_callback)
-                    processed_sheets += 1
-                    if progress_callback:
-                        progress_callback(processed_sheets, total_sheets, excel_sheet_name)
-
-            wb_formulas.close()
-            wb_values.close()
             self._log("✓ Обработка завершена", log_callback)
         except Exception as e:
             self._log(f"❌ Критическая ошибка: {e}", log_callback)
@@ -272,100 +592,246 @@ class ExcelToGoogleSheets:
             log_callback: Optional[Callable[[str], None]] = None
     ):
         try:
+            from gspread.utils import absolute_range_name
+
             self._log("Подключение к Google Таблицам...", log_callback)
             self.connect_to_google_sheets(google_sheet_url)
 
             total_mappings = len(file_mappings)
             processed = 0
+            worksheets = self._worksheets_by_title()
+
+            # Данные файлов отправляются общими values_batch_update
+            batched_data = []
+            batched_formats = []
+            prepared_files = []
+
+            # Пока текущий файл разбирается, следующие уже загружаются
+            # openpyxl в фоновых потоках. Разбор и запись остаются в этом
+            # потоке, чтобы сохранить порядок сообщений в логе.
+            with ThreadPoolExecutor(max_workers=_LOADER_WORKERS) as loader:
+                pending = [
+                    self._submit_workbook_load(loader, mapping)
+                    for mapping in file_mappings[:_LOADER_WORKERS]
+                ]
 
-            for mapping in file_mappings:
+                # Книги, загруженные заранее, но не разобранные из-за ошибки
+                # или прерывания, закрываются в finally
                 try:
-                    clear_column_cache()
-
-                    excel_path = mapping['excel_path']
-                    excel_sheet_name = mapping.get('excel_sheet', 'Sheet1')
-                    google_sheet_name = mapping['google_sheet']
+                    for index, mapping in enumerate(file_mappings):
+                        workbooks_future = pending.pop(0)
+                        if index + _LOADER_WORKERS < total_mappings:
+                            pending.append(self._submit_workbook_load(loader, file_mappings[index + _LOADER_WORKERS]))
+
+                        try:
+                            prepared = self._process_one_mapping(mapping, workbooks_future, worksheets, log_callback)
+                            if prepared is not None:
+                                google_sheet_name, payload = prepared
+                                batched_data.append({
+                                    'range': absolute_range_name(google_sheet_name, payload['range']),
+                                    'values': payload['values'],
+                                })
+                                batched_formats.append(payload['format_requests'])
+                                prepared_files.append((mapping['excel_path'], google_sheet_name, payload['rows']))
+                        except Exception as e:
+                            self._log(f"❌ Ошибка при обработке {mapping.get('excel_path', 'unknown')}: {e}", log_callback)
+                        finally:
+                            self._discard_workbooks(workbooks_future)
 
-                    self._log(
-                        f"Обработка: {os.path.basename(excel_path)} → {google_sheet_name}",
-                        log_callback
-                    )
-
-                    if not os.path.exists(excel_path):
-                        self._log(f"⚠️ Файл не найден: {excel_path}", log_callback)
                         processed += 1
                         if progress_callback:
-                            progress_callback(processed, total_mappings, os.path.basename(excel_path))
-                        continue
+                            progress_callback(processed, total_mappings, os.path.basename(mapping.get('excel_path', 'unknown')))
+                finally:
+                    for workbooks_future in pending:
+                        self._discard_workbooks(workbooks_future)
+
+            if batched_data:
+                errors = self._write_batch(batched_data, batched_formats, log_callback)
 
-                    wb_formulas = openpyxl.load_workbook(excel_path, data_only=False)
-                    wb_values = openpyxl.load_workbook(excel_path, data_only=True)
+                for (excel_path, google_sheet_name, rows_copied), error in zip(prepared_files, errors):
+                    if error is not None:
+                        self._log(f"❌ Ошибка при обработке {excel_path}: {error}", log_callback)
+                        continue
                     self._log(
-                        "Примечание: openpyxl не вычисляет формулы. Значения берутся из последнего сохранения файла.",
+                        f"✓ {os.path.basename(excel_path)} → {google_sheet_name}: скопировано строк: {rows_copied}",
                         log_callback
                     )
 
-                    if excel_sheet_name not in wb_formulas.sheetnames:
-                        if wb_formulas.sheetnames:
-                            excel_sheet_name = wb_formulas.sheetnames[0]
-                            self._log(f"Используется лист: {excel_sheet_name}", log_callback)
-                        else:
-                            self._log(f"⚠️ В файле нет листов", log_callback)
-                            wb_formulas.close()
-                            wb_values.close()
-                            processed += 1
-                            if progress_callback:
-                                progress_callback(processed, total_mappings, os.path.basename(excel_path))
-                            continue
-
-                    excel_sheet = wb_formulas[excel_sheet_name]
-                    excel_sheet_values = None
-                    if excel_sheet_name in wb_values.sheetnames:
-                        excel_sheet_values = wb_values[excel_sheet_name]
-                    else:
-                        self._log(
-                            f"⚠️ Лист '{excel_sheet_name}' отсутствует в книге значений (data_only=True). Формулы будут вставлены без вычисленных значений",
-                            log_callback
-                        )
-
-                    try:
-                        google_worksheet = self.google_sheet.worksheet(google_sheet_name)
-                    except gspread.exceptions.WorksheetNotFound:
-                        self._log(f"⚠️ Лист '{google_sheet_name}' не найден в Google Таблицах", log_callback)
-                        wb_formulas.close()
-                        wb_values.close()
-                        processed += 1
-                        if progress_callback:
-                            progress_callback(processed, total_mappings, os.path.basename(excel_path))
-                        continue
+            self._log("✓ Пакетная обработка завершена", log_callback)
+        except Exception as e:
+            self._log(f"❌ Критическая ошибка: {e}", log_callback)
+            raise
 
-                    self.config.column_mapping = mapping.get('column_mapping', {'source': ['A'], 'target': ['A']})
-                    self.config.start_row = mapping.get('start_row', 1)
+    def _worksheets_by_title(self) -> Dict[str, 'gspread.Worksheet']:
+        """Все листы Google таблицы, полученные одним запросом метаданных."""
+        return {worksheet.title: worksheet for worksheet in _retry(self.google_sheet.worksheets)}
 
-                    rows_copied = copy_sheet_data(
-                        excel_sheet,
-                        google_worksheet,
-                        self.config.column_mapping,
-                        self.config.start_row,
-                        log_callback,
-                        excel_sheet_values=excel_sheet_values
-                    )
+    def _load_workbooks(self, excel_path: str):
+        """Загрузка книги с формулами и книги со значениями.
 
-                    self._log(f"✓ Скопировано строк: {rows_copied}", log_callback)
+        Книги открываются в режиме ``read_only``: ``copy_sheet_data`` читает
+        листы одним проходом ``iter_rows`` и ничего в них не записывает.
+        """
+        import openpyxl
 
-                    wb_formulas.close()
-                    wb_values.close()
-                except Exception as e:
-                    self._log(f"❌ Ошибка при обработке {mapping.get('excel_path', 'unknown')}: {e}", log_callback)
+        wb_formulas = openpyxl.load_workbook(
+            excel_path, read_only=True, data_only=False, keep_links=False, keep_vba=False, rich_text=False
+        )
+        try:
+            wb_values = openpyxl.load_workbook(
+                excel_path, read_only=True, data_only=True, keep_links=False, keep_vba=False, rich_text=False
+            )
+        except Exception:
+            wb_formulas.close()
+            raise
+        return wb_formulas, wb_values
+
+    def _submit_workbook_load(self, executor: ThreadPoolExecutor, mapping: Dict) -> Optional[Future]:
+        excel_path = mapping.get('excel_path')
+        if not excel_path or not os.path.exists(excel_path):
+            return None
+        return executor.submit(self._load_workbooks, excel_path)
+
+    @staticmethod
+    def _discard_workbooks(workbooks_future: Optional[Future]):
+        """Отмена загрузки книг, а если они уже загружены, их закрытие."""
+        if workbooks_future is None or workbooks_future.cancel():
+            return
+        try:
+            wb_formulas, wb_values = workbooks_future.result()
+        except Exception:
+            return
+        wb_formulas.close()
+        wb_values.close()
 
-                processed += 1
-                if progress_callback:
-                    progress_callback(processed, total_mappings, os.path.basename(mapping.get('excel_path', 'unknown')))
+    def _process_one_mapping(
+            self,
+            mapping: Dict,
+            workbooks_future: Optional[Future],
+            worksheets: Dict[str, 'gspread.Worksheet'],
+            log_callback: Optional[Callable[[str], None]] = None
+    ) -> Optional[Tuple[str, Dict]]:
+        """Подготовка данных одного файла пакета.
+
+        Возвращает имя Google листа и результат ``build_sheet_payload`` или
+        ``None``, если записывать нечего. Книги из ``workbooks_future``
+        закрывает вызывающий код.
+        """
+        clear_column_cache()
+
+        excel_path = mapping['excel_path']
+        excel_sheet_name = mapping.get('excel_sheet', 'Sheet1')
+        google_sheet_name = mapping['google_sheet']
+
+        self._log(
+            f"Обработка: {os.path.basename(excel_path)} → {google_sheet_name}",
+            log_callback
+        )
+
+        if workbooks_future is None:
+            self._log(f"⚠️ Файл не найден: {excel_path}", log_callback)
+            return None
+
+        wb_formulas, wb_values = workbooks_future.result()
+        self._log(
+            "Примечание: openpyxl не вычисляет формулы. Значения берутся из последнего сохранения файла.",
+            log_callback
+        )
+
+        formula_names = wb_formulas.sheetnames
+        if excel_sheet_name not in formula_names:
+            if formula_names:
+                excel_sheet_name = formula_names[0]
+                self._log(f"Используется лист: {excel_sheet_name}", log_callback)
+            else:
+                self._log(f"⚠️ В файле нет листов", log_callback)
+                return None
+
+        excel_sheet = wb_formulas[excel_sheet_name]
+        excel_sheet_values = None
+        if excel_sheet_name in wb_values.sheetnames:
+            excel_sheet_values = wb_values[excel_sheet_name]
+        else:
+            self._log(
+                f"⚠️ Лист '{excel_sheet_name}' отсутствует в книге значений (data_only=True). Формулы будут вставлены без вычисленных значений",
+                log_callback
+            )
 
-            self._log("✓ Пакетная обработка завершена", log_callback)
-        except Exception as e:
-            self._log(f"❌ Критическая ошибка: {e}", log_callback)
-            raise
+        google_worksheet = worksheets.get(google_sheet_name)
+        if google_worksheet is None:
+            self._log(f"⚠️ Лист '{google_sheet_name}' не найден в Google Таблицах", log_callback)
+            return None
+
+        self.config.column_mapping = mapping.get('column_mapping', {'source': ['A'], 'target': ['A']})
+        self.config.start_row = mapping.get('start_row', 1)
+
+        payload = build_sheet_payload(
+            excel_sheet,
+            google_worksheet,
+            self.config.column_mapping,
+            self.config.start_row,
+            log_callback,
+            excel_sheet_values=excel_sheet_values
+        )
+        if payload is None:
+            self._log("✓ Скопировано строк: 0", log_callback)
+            return None
+        return google_sheet_name, payload
+
+    def _write_batch(self, batched_data: List[Dict], batched_formats: List[List[Dict]],
+                     log_callback: Optional[Callable[[str], None]] = None) -> List[Optional[Exception]]:
+        """Запись подготовленных диапазонов пачками и их форматирование.
+
+        ``batched_formats[i]`` содержит запросы форматирования диапазона
+        ``batched_data[i]``. Диапазоны отправляются пачками до
+        ``_WRITE_BATCH_CELLS`` ячеек. Если пачка не записалась, ее диапазоны
+        повторяются по одному, чтобы ошибка одного листа не отменяла запись
+        остальных. Возвращает ошибку записи каждого диапазона или ``None``.
+        """
+        self._log(f"Запись данных {len(batched_data)} листов в Google Sheets...", log_callback)
+
+        chunks = []
+        chunk: List[int] = []
+        chunk_cells = 0
+        for index, item in enumerate(batched_data):
+            cells = sum(len(row) for row in item['values'])
+            if chunk and chunk_cells + cells > _WRITE_BATCH_CELLS:
+                chunks.append(chunk)
+                chunk = []
+                chunk_cells = 0
+            chunk.append(index)
+            chunk_cells += cells
+        if chunk:
+            chunks.append(chunk)
+
+        errors: List[Optional[Exception]] = [None] * len(batched_data)
+        for chunk in chunks:
+            try:
+                self._values_batch_update([batched_data[index] for index in chunk])
+            except Exception as e:
+                if len(chunk) == 1:
+                    errors[chunk[0]] = e
+                    continue
+                self._log(f"Ошибка при записи в Google Sheets: {e}. Диапазоны записываются по одному", log_callback)
+                for index in chunk:
+                    try:
+                        self._values_batch_update([batched_data[index]])
+                    except Exception as range_error:
+                        errors[index] = range_error
+
+        format_requests = [
+            request
+            for requests, error in zip(batched_formats, errors) if error is None
+            for request in requests
+        ]
+        apply_format_requests(self.google_sheet, format_requests, log_callback)
+        return errors
+
+    def _values_batch_update(self, data: List[Dict]):
+        _retry(self.google_sheet.values_batch_update, {
+            'valueInputOption': 'USER_ENTERED',
+            'data': data,
+        })
 
     def _log(self, message: str, log_callback: Optional[Callable[[str], None]] = None):
         self.logger.info(message)
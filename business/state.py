@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from typing import List, Optional, Any
 
 
-@dataclass
+@dataclass(slots=True)
 class AppState:
     single_file: Optional[str] = None
     single_config: Optional[Any] = None
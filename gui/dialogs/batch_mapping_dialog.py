@@ -1,14 +1,243 @@
+import difflib
 import os
-from typing import List, Tuple
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
 
 from PySide6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget, QHeaderView, QComboBox,
-    QTableWidgetItem, QSpinBox, QDialogButtonBox, QPushButton, QFrame,
-    QFileDialog, QLineEdit, QWidget, QGroupBox, QGridLayout, QTextEdit,
-    QScrollArea, QSizePolicy
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QHeaderView, QComboBox, QSpinBox,
+    QDialogButtonBox, QPushButton, QFrame, QLineEdit, QGroupBox, QTableView,
+    QStyledItemDelegate, QAbstractItemView
 )
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QDragEnterEvent, QDropEvent, QFont, QPixmap, QPainter, QColor
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from ..utils import NO_SHEET_TEXT, column_index, column_range, google_sheets_model
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # rapidfuzz не установлен
+    fuzz = process = None
+
+
+# "источник → цель"; вместо стрелки можно набрать ASCII "->"
+_MAPPING_RE = re.compile(r'^\s*([^→]+?)\s*(?:→|->)\s*([^→]+?)\s*$')
+
+# Минимальное сходство rapidfuzz, при котором авто-маппинг выбирает лист,
+# не связанный с именем файла вхождением
+_FUZZY_CUTOFF = 90
+
+
+@dataclass(slots=True)
+class FileMappingState:
+    """Настройки маппинга одного Excel файла."""
+    excel_file: str
+    excel_sheet: str = "Sheet1"
+    google_sheet: str = ""
+    columns: str = "A → A"
+    start_row: int = 1
+    # Имя файла и имя без расширения: нужны при каждой отрисовке и сравнении
+    file_name: str = field(init=False, repr=False)
+    file_stem: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.file_name = os.path.basename(self.excel_file)
+        self.file_stem = os.path.splitext(self.file_name)[0]
+
+
+class BatchMappingModel(QAbstractTableModel):
+    """Настройки маппинга файлов пакета, по строке на Excel файл."""
+
+    COLUMN_FILE = 0
+    COLUMN_EXCEL_SHEET = 1
+    COLUMN_ARROW = 2
+    COLUMN_GOOGLE_SHEET = 3
+    COLUMN_COLUMNS = 4
+    COLUMN_START_ROW = 5
+
+    HEADERS = ("Файл", "Excel лист", "", "Google лист", "Колонки", "Начать со строки")
+    EDITABLE_COLUMNS = (COLUMN_EXCEL_SHEET, COLUMN_GOOGLE_SHEET, COLUMN_COLUMNS, COLUMN_START_ROW)
+    # Ключ строки для каждой редактируемой колонки
+    FIELDS = {
+        COLUMN_EXCEL_SHEET: 'excel_sheet',
+        COLUMN_GOOGLE_SHEET: 'google_sheet',
+        COLUMN_COLUMNS: 'columns',
+        COLUMN_START_ROW: 'start_row',
+    }
+
+    def __init__(self, excel_files: List[str], google_sheets: List[str], parent=None):
+        super().__init__(parent)
+        self.google_sheets = google_sheets
+        # Имена листов в нижнем регистре считаются один раз для всех
+        # сравнений с именами файлов
+        self.lower_sheets = [sheet.lower() for sheet in google_sheets]
+        self.sheet_by_lower: Dict[str, str] = {}
+        for sheet, sheet_name in zip(google_sheets, self.lower_sheets):
+            self.sheet_by_lower.setdefault(sheet_name, sheet)
+        self.rows: List[FileMappingState] = [FileMappingState(excel_file) for excel_file in excel_files]
+        for row in self.rows:
+            row.google_sheet = self.preselect_google_sheet(row.file_stem)
+
+    def preselect_google_sheet(self, file_stem: str) -> str:
+        """Google лист для начального выбора: совпадающий с именем файла или
+        первый, имя которого содержит имя файла или входит в него"""
+        file_name = file_stem.lower()
+        exact_match = self.sheet_by_lower.get(file_name)
+        if exact_match is not None:
+            return exact_match
+
+        for sheet, sheet_name in zip(self.google_sheets, self.lower_sheets):
+            if file_name in sheet_name or sheet_name in file_name:
+                return sheet
+        return ""
+
+    def match_google_sheet(self, file_stem: str) -> str:
+        """Google лист, имя которого больше всего похоже на имя файла, или пустая строка"""
+        file_name = file_stem.lower()
+        exact_match = self.sheet_by_lower.get(file_name)
+        if exact_match is not None:
+            return exact_match
+
+        # Самый похожий из листов, содержащих имя файла или входящих в него
+        best_match = ""
+        best_score = 0.0
+        for sheet, sheet_name in zip(self.google_sheets, self.lower_sheets):
+            if file_name in sheet_name or sheet_name in file_name:
+                score = difflib.SequenceMatcher(None, file_name, sheet_name).ratio()
+                if score > best_score:
+                    best_score = score
+                    best_match = sheet
+        if best_match or process is None:
+            return best_match
+
+        # С rapidfuzz подходит и лист с очень похожим именем без вхождения
+        match = process.extractOne(
+            file_name, self.lower_sheets, scorer=fuzz.token_set_ratio, score_cutoff=_FUZZY_CUTOFF
+        )
+        return self.google_sheets[match[2]] if match else ""
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == self.COLUMN_FILE:
+                return f"📄 {row.file_name}"
+            if column == self.COLUMN_ARROW:
+                return "→"
+            if column == self.COLUMN_GOOGLE_SHEET:
+                return f"📋 {row.google_sheet}" if row.google_sheet else NO_SHEET_TEXT
+            return getattr(row, self.FIELDS[column])
+        if role == Qt.ItemDataRole.EditRole and column in self.FIELDS:
+            return getattr(row, self.FIELDS[column])
+        if role == Qt.ItemDataRole.ToolTipRole and column == self.COLUMN_FILE:
+            return row.excel_file
+        if role == Qt.ItemDataRole.TextAlignmentRole and column in (self.COLUMN_ARROW, self.COLUMN_START_ROW):
+            return int(Qt.AlignmentFlag.AlignCenter)
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole or index.column() not in self.FIELDS:
+            return False
+        field = self.FIELDS[index.column()]
+        row = self.rows[index.row()]
+        if getattr(row, field) == value:
+            return False
+        setattr(row, field, value)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+        return True
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and index.column() in self.EDITABLE_COLUMNS:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def set_column_values(self, field: str, values: Dict[int, object]):
+        """Записывает своё значение поля в каждую из строк ``values``"""
+        if not values:
+            return
+        for i, value in values.items():
+            setattr(self.rows[i], field, value)
+        self.dataChanged.emit(self.index(min(values), 0), self.index(max(values), len(self.HEADERS) - 1))
+
+    def update_rows(self, changes: Dict[str, object]):
+        """Записывает значения полей во все строки и уведомляет вид одним сигналом.
+
+        Строки, в которых поля уже имеют эти значения, не трогаются; если
+        таких строк нет, сигнал не отправляется.
+        """
+        changed = [
+            i for i, row in enumerate(self.rows)
+            if any(getattr(row, field) != value for field, value in changes.items())
+        ]
+        if not changed:
+            return
+        for i in changed:
+            row = self.rows[i]
+            for field, value in changes.items():
+                setattr(row, field, value)
+        self.dataChanged.emit(self.index(changed[0], 0), self.index(changed[-1], len(self.HEADERS) - 1))
+
+
+class MappingDelegate(QStyledItemDelegate):
+    """Редакторы ячеек таблицы маппинга; создаются только на время редактирования."""
+
+    def __init__(self, google_sheets: List[str], parent=None):
+        super().__init__(parent)
+        self.google_sheets = google_sheets
+        # Один список листов на все редакторы-комбобоксы
+        self.sheet_model = google_sheets_model(google_sheets, self)
+
+    def createEditor(self, parent, option, index):
+        column = index.column()
+        if column == BatchMappingModel.COLUMN_GOOGLE_SHEET:
+            editor = QComboBox(parent)
+            editor.setModel(self.sheet_model)
+            return editor
+        if column == BatchMappingModel.COLUMN_START_ROW:
+            editor = QSpinBox(parent)
+            editor.setMinimum(1)
+            editor.setMaximum(10000)
+            return editor
+
+        editor = super().createEditor(parent, option, index)
+        if isinstance(editor, QLineEdit):
+            if column == BatchMappingModel.COLUMN_EXCEL_SHEET:
+                editor.setPlaceholderText("Имя листа в Excel файле")
+            elif column == BatchMappingModel.COLUMN_COLUMNS:
+                editor.setPlaceholderText("Например: A,B,C → D,E,F или A-C → D-F")
+        return editor
+
+    def setEditorData(self, editor, index):
+        value = index.data(Qt.ItemDataRole.EditRole)
+        if isinstance(editor, QComboBox):
+            editor.setCurrentIndex(max(editor.findData(value), 0))
+        elif isinstance(editor, QSpinBox):
+            editor.setValue(int(value))
+        else:
+            super().setEditorData(editor, index)
+
+    def setModelData(self, editor, model, index):
+        if isinstance(editor, QComboBox):
+            model.setData(index, editor.currentData(), Qt.ItemDataRole.EditRole)
+        elif isinstance(editor, QSpinBox):
+            editor.interpretText()
+            model.setData(index, editor.value(), Qt.ItemDataRole.EditRole)
+        else:
+            super().setModelData(editor, model, index)
 
 
 class BatchMappingDialog(QDialog):
@@ -23,47 +252,8 @@ class BatchMappingDialog(QDialog):
         self.setWindowTitle("Настройка пакетного маппинга")
         self.setModal(True)
         self.resize(900, 650)
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #ffffff;
-            }
-            QLabel {
-                color: #212529;
-            }
-            QPushButton {
-                background-color: #0066cc;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: 500;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #0052a3;
-            }
-            QPushButton:pressed {
-                background-color: #004080;
-            }
-            QPushButton:disabled {
-                background-color: #e9ecef;
-                color: #6c757d;
-            }
-            QGroupBox {
-                font-weight: 600;
-                color: #495057;
-                border: 2px solid #e9ecef;
-                border-radius: 8px;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-                background-color: white;
-            }
-        """)
+        # Оформление задается правилами #batchMappingDialog в styles.APP_STYLE
+        self.setObjectName("batchMappingDialog")
         self.init_ui()
 
     def init_ui(self):
@@ -86,7 +276,7 @@ class BatchMappingDialog(QDialog):
         title.setStyleSheet("font-size: 18px; font-weight: 600; color: #0066cc; margin-bottom: 5px;")
 
         instruction = QLabel(
-            "Для каждого Excel файла настройте:\n"
+            "Для каждого Excel файла настройте (щелкните по ячейке, чтобы изменить):\n"
             "• Какой лист из Excel копировать\n"
             "• В какой лист Google Таблицы вставлять\n"
             "• Какие колонки копировать (формат: A,B,C → D,E,F)\n"
@@ -99,27 +289,27 @@ class BatchMappingDialog(QDialog):
         header_frame.setLayout(header_layout)
         layout.addWidget(header_frame)
 
-        # Скроллируемая область для файлов
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-
-        scroll_widget = QWidget()
-        scroll_layout = QVBoxLayout()
-        scroll_layout.setSpacing(15)
-
-        # Создаем карточку для каждого файла
-        self.file_widgets = []
-        for i, excel_file in enumerate(self.excel_files):
-            file_widget = self.create_file_mapping_widget(excel_file, i)
-            self.file_widgets.append(file_widget)
-            scroll_layout.addWidget(file_widget)
-
-        scroll_layout.addStretch()
-        scroll_widget.setLayout(scroll_layout)
-        scroll_area.setWidget(scroll_widget)
-        layout.addWidget(scroll_area)
+        # Таблица файлов: виджеты-редакторы создаются только для
+        # редактируемой ячейки, а не для каждого файла
+        self.model = BatchMappingModel(self.excel_files, self.google_sheets, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setItemDelegate(MappingDelegate(self.google_sheets, self.table))
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.AllEditTriggers)
+        self.table.setAlternatingRowColors(True)
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setDefaultSectionSize(40)
+
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setSectionResizeMode(BatchMappingModel.COLUMN_FILE, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(BatchMappingModel.COLUMN_ARROW, QHeaderView.ResizeMode.Fixed)
+        self.table.setColumnWidth(BatchMappingModel.COLUMN_EXCEL_SHEET, 120)
+        self.table.setColumnWidth(BatchMappingModel.COLUMN_ARROW, 30)
+        self.table.setColumnWidth(BatchMappingModel.COLUMN_GOOGLE_SHEET, 180)
+        self.table.setColumnWidth(BatchMappingModel.COLUMN_COLUMNS, 160)
+        self.table.setColumnWidth(BatchMappingModel.COLUMN_START_ROW, 130)
+        layout.addWidget(self.table)
 
         # Быстрые действия
         quick_actions_group = QGroupBox("⚡ Быстрые действия")
@@ -127,15 +317,15 @@ class BatchMappingDialog(QDialog):
 
         select_all_btn = QPushButton("Выбрать все Google листы")
         select_all_btn.clicked.connect(self.select_all_sheets)
-        select_all_btn.setStyleSheet("QPushButton { background-color: #28a745; }")
+        select_all_btn.setObjectName("successButton")
 
         auto_map_btn = QPushButton("Авто-маппинг по именам")
         auto_map_btn.clicked.connect(self.auto_map_by_names)
-        auto_map_btn.setStyleSheet("QPushButton { background-color: #17a2b8; }")
+        auto_map_btn.setObjectName("infoButton")
 
         reset_btn = QPushButton("Сбросить все")
         reset_btn.clicked.connect(self.reset_all_mappings)
-        reset_btn.setStyleSheet("QPushButton { background-color: #6c757d; }")
+        reset_btn.setObjectName("neutralButton")
 
         quick_layout.addWidget(select_all_btn)
         quick_layout.addWidget(auto_map_btn)
@@ -153,211 +343,74 @@ class BatchMappingDialog(QDialog):
         # Стилизуем кнопки
         ok_btn = buttons.button(QDialogButtonBox.StandardButton.Ok)
         ok_btn.setText("✓ Применить настройки")
-        ok_btn.setStyleSheet("QPushButton { background-color: #28a745; min-width: 140px; }")
+        ok_btn.setObjectName("acceptButton")
 
         cancel_btn = buttons.button(QDialogButtonBox.StandardButton.Cancel)
         cancel_btn.setText("✕ Отмена")
-        cancel_btn.setStyleSheet("QPushButton { background-color: #dc3545; }")
+        cancel_btn.setObjectName("dangerButton")
 
         layout.addWidget(buttons)
         self.setLayout(layout)
 
-    def create_file_mapping_widget(self, excel_file: str, index: int) -> QGroupBox:
-        """Создание виджета настройки для одного файла"""
-        file_name = os.path.basename(excel_file)
-        group = QGroupBox(f"📄 {file_name}")
-
-        layout = QGridLayout()
-        layout.setSpacing(10)
-
-        # Excel лист
-        layout.addWidget(QLabel("Excel лист:"), 0, 0)
-        excel_sheet_input = QLineEdit("Sheet1")
-        excel_sheet_input.setPlaceholderText("Имя листа в Excel файле")
-        excel_sheet_input.setStyleSheet("""
-            QLineEdit {
-                padding: 8px;
-                border: 1px solid #ced4da;
-                border-radius: 4px;
-                font-size: 13px;
-            }
-            QLineEdit:focus { border-color: #0066cc; }
-        """)
-        layout.addWidget(excel_sheet_input, 0, 1)
-
-        # Стрелка
-        arrow_label = QLabel("→")
-        arrow_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        arrow_label.setStyleSheet("font-size: 20px; font-weight: bold; color: #0066cc;")
-        layout.addWidget(arrow_label, 0, 2)
-
-        # Google лист
-        layout.addWidget(QLabel("Google лист:"), 0, 3)
-        google_combo = QComboBox()
-        google_combo.addItem("-- Не копировать --", "")
-        for sheet in self.google_sheets:
-            google_combo.addItem(f"📋 {sheet}", sheet)
-
-        google_combo.setStyleSheet("""
-            QComboBox {
-                padding: 8px;
-                border: 1px solid #ced4da;
-                border-radius: 4px;
-                font-size: 13px;
-                min-width: 150px;
-            }
-            QComboBox:hover { border-color: #90caf9; }
-            QComboBox::drop-down {
-                border: none;
-                width: 20px;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 5px solid #6c757d;
-                margin-right: 5px;
-            }
-        """)
-
-        # Автоматический выбор похожего листа
-        file_name_without_ext = os.path.splitext(file_name)[0]
-        for i in range(1, google_combo.count()):
-            sheet_name = google_combo.itemData(i)
-            if (file_name_without_ext.lower() in sheet_name.lower() or
-                    sheet_name.lower() in file_name_without_ext.lower()):
-                google_combo.setCurrentIndex(i)
-                break
-
-        layout.addWidget(google_combo, 0, 4)
-
-        # Настройки колонок
-        columns_frame = QFrame()
-        columns_frame.setStyleSheet("""
-            QFrame {
-                background-color: #f8f9fa;
-                border: 1px solid #e9ecef;
-                border-radius: 6px;
-                padding: 10px;
-            }
-        """)
-        columns_layout = QHBoxLayout()
-
-        columns_layout.addWidget(QLabel("Колонки:"))
-
-        columns_input = QLineEdit("A → A")
-        columns_input.setPlaceholderText("Например: A,B,C → D,E,F или A-C → D-F")
-        columns_input.setStyleSheet("""
-            QLineEdit {
-                padding: 6px;
-                border: 1px solid #ced4da;
-                border-radius: 4px;
-                font-family: monospace;
-                font-size: 12px;
-            }
-        """)
-        columns_layout.addWidget(columns_input)
-
-        columns_layout.addWidget(QLabel("Начать со строки:"))
-
-        start_row_spin = QSpinBox()
-        start_row_spin.setMinimum(1)
-        start_row_spin.setMaximum(10000)
-        start_row_spin.setValue(1)
-        start_row_spin.setStyleSheet("""
-            QSpinBox {
-                padding: 6px;
-                border: 1px solid #ced4da;
-                border-radius: 4px;
-                min-width: 60px;
-            }
-        """)
-        columns_layout.addWidget(start_row_spin)
-
-        columns_frame.setLayout(columns_layout)
-        layout.addWidget(columns_frame, 1, 0, 1, 5)
-
-        # Сохраняем ссылки на виджеты
-        group.excel_file = excel_file
-        group.excel_sheet_input = excel_sheet_input
-        group.google_combo = google_combo
-        group.columns_input = columns_input
-        group.start_row_spin = start_row_spin
-
-        group.setLayout(layout)
-        return group
+    def _commit_editor(self):
+        """Сохраняет в модель значение из открытого редактора ячейки"""
+        editor = self.table.indexWidget(self.table.currentIndex())
+        if editor is not None:
+            self.table.commitData(editor)
 
     def select_all_sheets(self):
         """Выбрать Google лист для всех файлов"""
-        for widget in self.file_widgets:
-            combo = widget.google_combo
-            if combo.count() > 1:
-                combo.setCurrentIndex(1)
+        self._commit_editor()
+        if self.google_sheets:
+            self.model.update_rows({'google_sheet': self.google_sheets[0]})
 
     def auto_map_by_names(self):
         """Автоматический маппинг по именам файлов"""
-        for widget in self.file_widgets:
-            file_path = widget.excel_file
-            file_name = os.path.splitext(os.path.basename(file_path))[0].lower()
-            combo = widget.google_combo
-
-            best_match_index = 0
-            best_score = 0
-
-            for i in range(1, combo.count()):
-                sheet_name = combo.itemData(i).lower()
-
-                # Точное совпадение
-                if file_name == sheet_name:
-                    combo.setCurrentIndex(i)
-                    break
-
-                # Частичное совпадение
-                elif file_name in sheet_name or sheet_name in file_name:
-                    # Подсчет общих символов
-                    score = len(set(file_name) & set(sheet_name))
-                    if score > best_score:
-                        best_score = score
-                        best_match_index = i
-            else:
-                if best_match_index > 0:
-                    combo.setCurrentIndex(best_match_index)
+        self._commit_editor()
+        matches = {}
+        for row_index, row in enumerate(self.model.rows):
+            match = self.model.match_google_sheet(row.file_stem)
+            if match:
+                matches[row_index] = match
+
+        self.model.set_column_values('google_sheet', matches)
 
     def reset_all_mappings(self):
         """Сброс всех настроек"""
-        for widget in self.file_widgets:
-            widget.google_combo.setCurrentIndex(0)
-            widget.excel_sheet_input.setText("Sheet1")
-            widget.columns_input.setText("A → A")
-            widget.start_row_spin.setValue(1)
+        self._commit_editor()
+        self.model.update_rows({
+            'google_sheet': "",
+            'excel_sheet': "Sheet1",
+            'columns': "A → A",
+            'start_row': 1,
+        })
 
     def validate_and_accept(self):
         """Валидация и принятие настроек"""
+        self._commit_editor()
         self.mappings = []
         errors = []
 
-        for i, widget in enumerate(self.file_widgets):
-            if widget.google_combo.currentData() == "":
+        for row in self.model.rows:
+            if row.google_sheet == "":
                 continue  # Пропускаем файлы с "Не копировать"
 
-            file_name = os.path.basename(widget.excel_file)
-
             try:
-                source_cols, target_cols = self.parse_column_mapping(widget.columns_input.text())
+                source_cols, target_cols = self.parse_column_mapping(row.columns)
 
                 self.mappings.append({
-                    'excel_path': widget.excel_file,
-                    'excel_sheet': widget.excel_sheet_input.text(),
-                    'google_sheet': widget.google_combo.currentData(),
+                    'excel_path': row.excel_file,
+                    'excel_sheet': row.excel_sheet,
+                    'google_sheet': row.google_sheet,
                     'column_mapping': {
                         'source': source_cols,
                         'target': target_cols
                     },
-                    'start_row': widget.start_row_spin.value()
+                    'start_row': row.start_row
                 })
 
             except ValueError as e:
-                errors.append(f"Файл '{file_name}': {e}")
+                errors.append(f"Файл '{row.file_name}': {e}")
 
         if errors:
             from PySide6.QtWidgets import QMessageBox
@@ -379,18 +432,12 @@ class BatchMappingDialog(QDialog):
 
     def parse_column_mapping(self, text: str) -> Tuple[List[str], List[str]]:
         """Парсинг маппинга колонок"""
-        if '→' not in text:
+        match = _MAPPING_RE.match(text)
+        if not match:
             raise ValueError("Используйте формат: 'A,B,C → D,E,F' или 'A-C → D-F'")
 
-        parts = text.split('→')
-        if len(parts) != 2:
-            raise ValueError("Используйте формат: 'A,B,C → D,E,F'")
-
-        source_part = parts[0].strip()
-        target_part = parts[1].strip()
-
-        source_cols = self.parse_column_range(source_part)
-        target_cols = self.parse_column_range(target_part)
+        source_cols = self.parse_column_range(match.group(1))
+        target_cols = self.parse_column_range(match.group(2))
 
         if len(source_cols) != len(target_cols):
             raise ValueError(f"Количество колонок должно совпадать: {len(source_cols)} ≠ {len(target_cols)}")
@@ -410,16 +457,16 @@ class BatchMappingDialog(QDialog):
             start_col = parts[0].strip().upper()
             end_col = parts[1].strip().upper()
 
-            if not start_col.isalpha() or not end_col.isalpha() or len(start_col) != 1 or len(end_col) != 1:
-                raise ValueError(f"Неверные колонки в диапазоне: {text}")
+            start_index = column_index(start_col)
+            end_index = column_index(end_col)
 
-            start_ord = ord(start_col)
-            end_ord = ord(end_col)
+            if start_index is None or end_index is None:
+                raise ValueError(f"Неверные колонки в диапазоне: {text}")
 
-            if start_ord > end_ord:
+            if start_index > end_index:
                 raise ValueError(f"Неверный порядок в диапазоне: {text}")
 
-            return [chr(i) for i in range(start_ord, end_ord + 1)]
+            return column_range(start_index, end_index)
 
         # Список колонок вида A,B,C
         else:
@@ -428,7 +475,7 @@ class BatchMappingDialog(QDialog):
                 raise ValueError("Не указаны колонки")
 
             for col in cols:
-                if not col.isalpha() or len(col) != 1:
+                if column_index(col) is None:
                     raise ValueError(f"Неверная колонка: {col}")
 
             return cols
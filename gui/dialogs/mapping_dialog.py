@@ -1,11 +1,76 @@
+import re
 from typing import List
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget, QHeaderView, QComboBox,
     QTableWidgetItem, QSpinBox, QDialogButtonBox, QFrame, QLineEdit, QGroupBox,
-    QGridLayout, QScrollArea, QWidget
+    QGridLayout, QScrollArea, QWidget, QStyledItemDelegate, QAbstractItemView
 )
 from PySide6.QtCore import Qt
+from PySide6.QtGui import QBrush, QColor, QFont
 from .. import styles
+from ..utils import NO_SHEET_TEXT, column_index, column_range, google_sheets_model
+
+# Стили, общие для нескольких виджетов диалога, собираются один раз
+_GROUP_QSS = f"""
+    QGroupBox {{
+        font-size: 16px;
+        font-weight: 600;
+        color: {styles.COLORS['gray_800']};
+        border: 2px solid {styles.COLORS['gray_200']};
+        border-radius: {styles.BORDER_RADIUS['lg']};
+        margin-top: {styles.SPACING['lg']};
+        padding-top: {styles.SPACING['lg']};
+        background-color: {styles.COLORS['white']};
+    }}
+    QGroupBox::title {{
+        subcontrol-origin: margin;
+        left: {styles.SPACING['lg']};
+        padding: 0 {styles.SPACING['sm']};
+        background-color: {styles.COLORS['white']};
+    }}
+"""
+
+# Диапазон колонок вида "A-C" или "AA - AD"
+_RANGE_RE = re.compile(r'^([A-Z]{1,3})\s*-\s*([A-Z]{1,3})$')
+
+_GOOGLE_COMBO_QSS = f"""
+    QComboBox {{
+        border: 1px solid {styles.COLORS['gray_300']};
+        border-radius: {styles.BORDER_RADIUS['sm']};
+        padding: {styles.SPACING['sm']};
+        background-color: {styles.COLORS['white']};
+        font-size: 14px;
+    }}
+    QComboBox:hover {{
+        border-color: {styles.COLORS['primary']};
+    }}
+"""
+
+
+class SheetDelegate(QStyledItemDelegate):
+    """Комбобокс выбора Google листа; создается только на время редактирования.
+
+    Имя выбранного листа хранится в UserRole ячейки, текст ячейки только для показа.
+    """
+
+    def __init__(self, google_sheets: List[str], parent=None):
+        super().__init__(parent)
+        # Один список листов на все редакторы
+        self.sheet_model = google_sheets_model(google_sheets, self)
+
+    def createEditor(self, parent, option, index):
+        editor = QComboBox(parent)
+        editor.setModel(self.sheet_model)
+        editor.setStyleSheet(_GOOGLE_COMBO_QSS)
+        return editor
+
+    def setEditorData(self, editor, index):
+        value = index.data(Qt.ItemDataRole.UserRole) or ""
+        editor.setCurrentIndex(max(editor.findData(value), 0))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentData(), Qt.ItemDataRole.UserRole)
+        model.setData(index, editor.currentText(), Qt.ItemDataRole.DisplayRole)
 
 
 class MappingDialog(QDialog):
@@ -88,24 +153,7 @@ class MappingDialog(QDialog):
     def create_sheets_mapping_section(self, parent_layout):
         """Создает секцию маппинга листов"""
         sheets_group = QGroupBox("📋 Соответствие листов")
-        sheets_group.setStyleSheet(f"""
-            QGroupBox {{
-                font-size: 16px;
-                font-weight: 600;
-                color: {styles.COLORS['gray_800']};
-                border: 2px solid {styles.COLORS['gray_200']};
-                border-radius: {styles.BORDER_RADIUS['lg']};
-                margin-top: {styles.SPACING['lg']};
-                padding-top: {styles.SPACING['lg']};
-                background-color: {styles.COLORS['white']};
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: {styles.SPACING['lg']};
-                padding: 0 {styles.SPACING['sm']};
-                background-color: {styles.COLORS['white']};
-            }}
-        """)
+        sheets_group.setStyleSheet(_GROUP_QSS)
 
         sheets_layout = QVBoxLayout(sheets_group)
         sheets_layout.setSpacing(16)
@@ -125,8 +173,21 @@ class MappingDialog(QDialog):
         header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
         self.sheet_table.setColumnWidth(1, 50)
 
-        # Заполнение таблицы
-        self.populate_sheets_table()
+        # Google лист выбирается через делегат, а не через виджет в каждой строке
+        self.sheet_table.setItemDelegateForColumn(2, SheetDelegate(self.google_sheets, self.sheet_table))
+        self.sheet_table.setEditTriggers(QAbstractItemView.EditTrigger.AllEditTriggers)
+
+        # Заполнение таблицы без перерисовки, сигналов и сортировки после каждой строки
+        sorting_enabled = self.sheet_table.isSortingEnabled()
+        self.sheet_table.setSortingEnabled(False)
+        self.sheet_table.setUpdatesEnabled(False)
+        self.sheet_table.blockSignals(True)
+        try:
+            self.populate_sheets_table()
+        finally:
+            self.sheet_table.blockSignals(False)
+            self.sheet_table.setUpdatesEnabled(True)
+            self.sheet_table.setSortingEnabled(sorting_enabled)
 
         sheets_layout.addWidget(self.sheet_table)
         parent_layout.addWidget(sheets_group)
@@ -134,71 +195,41 @@ class MappingDialog(QDialog):
     def populate_sheets_table(self):
         """Заполняет таблицу маппинга листов"""
         self.sheet_table.setRowCount(len(self.excel_sheets))
+        google_names = set(self.google_sheets)
+
+        # Оформление и флаги неизменяемых ячеек общие для всех строк
+        read_only_flags = Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled
+        excel_brush = QBrush(QColor(styles.COLORS['gray_800']))
+        arrow_brush = QBrush(QColor(styles.COLORS['primary']))
+        arrow_font = QFont(self.sheet_table.font())
+        arrow_font.setBold(True)
+        arrow_font.setPixelSize(16)
 
         for i, excel_sheet in enumerate(self.excel_sheets):
             # Excel лист (неизменяемый)
             excel_item = QTableWidgetItem(f"📄 {excel_sheet}")
-            excel_item.setFlags(excel_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            excel_item.setStyleSheet(f"color: {styles.COLORS['gray_800']};")
+            excel_item.setFlags(read_only_flags)
+            excel_item.setForeground(excel_brush)
             self.sheet_table.setItem(i, 0, excel_item)
 
             # Стрелка (неизменяемая)
             arrow_item = QTableWidgetItem("→")
             arrow_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            arrow_item.setFlags(arrow_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            arrow_item.setStyleSheet(f"color: {styles.COLORS['primary']}; font-weight: bold; font-size: 16px;")
+            arrow_item.setFlags(read_only_flags)
+            arrow_item.setForeground(arrow_brush)
+            arrow_item.setFont(arrow_font)
             self.sheet_table.setItem(i, 1, arrow_item)
 
-            # Google лист (выпадающий список)
-            google_combo = QComboBox()
-            google_combo.addItem("-- Не копировать --", "")
-
-            for sheet in self.google_sheets:
-                google_combo.addItem(f"📋 {sheet}", sheet)
-
-            google_combo.setStyleSheet(f"""
-                QComboBox {{
-                    border: 1px solid {styles.COLORS['gray_300']};
-                    border-radius: {styles.BORDER_RADIUS['sm']};
-                    padding: {styles.SPACING['sm']};
-                    background-color: {styles.COLORS['white']};
-                    font-size: 14px;
-                }}
-                QComboBox:hover {{
-                    border-color: {styles.COLORS['primary']};
-                }}
-            """)
-
-            # Автоматический выбор совпадающего листа
-            if excel_sheet in self.google_sheets:
-                for j in range(google_combo.count()):
-                    if google_combo.itemData(j) == excel_sheet:
-                        google_combo.setCurrentIndex(j)
-                        break
-
-            self.sheet_table.setCellWidget(i, 2, google_combo)
+            # Google лист (выбирается в SheetDelegate), по умолчанию совпадающий по имени
+            google_sheet = excel_sheet if excel_sheet in google_names else ""
+            google_item = QTableWidgetItem(f"📋 {google_sheet}" if google_sheet else NO_SHEET_TEXT)
+            google_item.setData(Qt.ItemDataRole.UserRole, google_sheet)
+            self.sheet_table.setItem(i, 2, google_item)
 
     def create_columns_mapping_section(self, parent_layout):
         """Создает секцию настройки колонок"""
         columns_group = QGroupBox("📊 Настройка колонок и строк")
-        columns_group.setStyleSheet(f"""
-            QGroupBox {{
-                font-size: 16px;
-                font-weight: 600;
-                color: {styles.COLORS['gray_800']};
-                border: 2px solid {styles.COLORS['gray_200']};
-                border-radius: {styles.BORDER_RADIUS['lg']};
-                margin-top: {styles.SPACING['lg']};
-                padding-top: {styles.SPACING['lg']};
-                background-color: {styles.COLORS['white']};
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: {styles.SPACING['lg']};
-                padding: 0 {styles.SPACING['sm']};
-                background-color: {styles.COLORS['white']};
-            }}
-        """)
+        columns_group.setStyleSheet(_GROUP_QSS)
 
         columns_layout = QGridLayout(columns_group)
         columns_layout.setSpacing(16)
@@ -344,8 +375,7 @@ class MappingDialog(QDialog):
         sheet_mapping = {}
         for i in range(self.sheet_table.rowCount()):
             excel_sheet = self.sheet_table.item(i, 0).text().replace("📄 ", "")
-            google_combo = self.sheet_table.cellWidget(i, 2)
-            google_sheet = google_combo.currentData()
+            google_sheet = self.sheet_table.item(i, 2).data(Qt.ItemDataRole.UserRole)
 
             if google_sheet:  # Если выбран Google лист
                 sheet_mapping[excel_sheet] = google_sheet
@@ -370,24 +400,17 @@ class MappingDialog(QDialog):
             return ['A']
 
         # Обработка диапазона (A-C)
-        if '-' in text and ',' not in text:
-            parts = text.split('-')
-            if len(parts) == 2:
-                start_col = parts[0].strip()
-                end_col = parts[1].strip()
-
-                if start_col.isalpha() and end_col.isalpha() and len(start_col) == 1 and len(end_col) == 1:
-                    start_ord = ord(start_col)
-                    end_ord = ord(end_col)
-                    return [chr(i) for i in range(start_ord, end_ord + 1)]
+        match = _RANGE_RE.match(text)
+        if match:
+            start_index = column_index(match.group(1))
+            end_index = column_index(match.group(2))
+            if start_index is not None and end_index is not None:
+                return column_range(start_index, end_index)
 
         # Обработка списка (A,B,C)
         cols = [col.strip() for col in text.split(',') if col.strip()]
 
         # Фильтруем только валидные колонки
-        valid_cols = []
-        for col in cols:
-            if col.isalpha() and len(col) == 1:
-                valid_cols.append(col)
+        valid_cols = [col for col in cols if column_index(col) is not None]
 
-        return valid_cols if valid_cols else ['A']
\ No newline at end of file
+        return valid_cols if valid_cols else ['A']
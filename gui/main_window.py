@@ -49,7 +49,7 @@ class MainWindow(QMainWindow):
 
         # Основная область (слева)
         self.content_widget = QWidget()
-        self.content_widget.setStyleSheet("background: white;")
+        self.content_widget.setObjectName("contentWidget")
         main_layout.addWidget(self.content_widget)
 
         # Слайдер логов (справа)
@@ -317,42 +317,12 @@ class MainWindow(QMainWindow):
 
         self.single_mapping_btn = QPushButton("⚙️ Настроить маппинг")
         self.single_mapping_btn.setEnabled(False)
-        self.single_mapping_btn.setStyleSheet("""
-            QPushButton {
-                background: #6c757d;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 10px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: #5a6268;
-            }
-            QPushButton:disabled {
-                background: #ccc;
-            }
-        """)
+        self.single_mapping_btn.setObjectName("mappingButton")
         self.single_mapping_btn.setFixedHeight(36)
 
         self.single_process_btn = QPushButton("🚀 Начать копирование")
         self.single_process_btn.setEnabled(False)
-        self.single_process_btn.setStyleSheet("""
-            QPushButton {
-                background: #28a745;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 10px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: #218838;
-            }
-            QPushButton:disabled {
-                background: #ccc;
-            }
-        """)
+        self.single_process_btn.setObjectName("processButton")
         self.single_process_btn.setFixedHeight(36)
 
         buttons_layout.addWidget(self.single_mapping_btn)
@@ -412,35 +382,11 @@ class MainWindow(QMainWindow):
         list_buttons_layout.setSpacing(8)
 
         self.clear_btn = QPushButton("🗑️ Очистить")
-        self.clear_btn.setStyleSheet("""
-            QPushButton {
-                background: transparent;
-                color: #666;
-                border: 1px solid #ddd;
-                border-radius: 4px;
-                padding: 6px 12px;
-                font-size: 12px;
-            }
-            QPushButton:hover {
-                background: #f8f9fa;
-            }
-        """)
+        self.clear_btn.setObjectName("listButton")
         self.clear_btn.setFixedHeight(28)
 
         self.remove_btn = QPushButton("➖ Удалить выбранные")
-        self.remove_btn.setStyleSheet("""
-            QPushButton {
-                background: transparent;
-                color: #666;
-                border: 1px solid #ddd;
-                border-radius: 4px;
-                padding: 6px 12px;
-                font-size: 12px;
-            }
-            QPushButton:hover {
-                background: #f8f9fa;
-            }
-        """)
+        self.remove_btn.setObjectName("listButton")
         self.remove_btn.setFixedHeight(28)
 
         list_buttons_layout.addWidget(self.clear_btn)
@@ -453,42 +399,12 @@ class MainWindow(QMainWindow):
 
         self.batch_mapping_btn = QPushButton("⚙️ Настроить маппинг")
         self.batch_mapping_btn.setEnabled(False)
-        self.batch_mapping_btn.setStyleSheet("""
-            QPushButton {
-                background: #6c757d;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 10px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: #5a6268;
-            }
-            QPushButton:disabled {
-                background: #ccc;
-            }
-        """)
+        self.batch_mapping_btn.setObjectName("mappingButton")
         self.batch_mapping_btn.setFixedHeight(36)
 
         self.batch_process_btn = QPushButton("🚀 Начать копирование")
         self.batch_process_btn.setEnabled(False)
-        self.batch_process_btn.setStyleSheet("""
-            QPushButton {
-                background: #28a745;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 10px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: #218838;
-            }
-            QPushButton:disabled {
-                background: #ccc;
-            }
-        """)
+        self.batch_process_btn.setObjectName("processButton")
         self.batch_process_btn.setFixedHeight(36)
 
         main_buttons_layout.addWidget(self.batch_mapping_btn)
@@ -937,22 +853,19 @@ class MainWindow(QMainWindow):
         msg.setStandardButtons(QMessageBox.StandardButton.Ok)
         msg.exec()
 
+    def closeEvent(self, event):
+        """Останавливает фоновый поток обработки при закрытии окна"""
+        self.logic.shutdown()
+        super().closeEvent(event)
+
 
 def main():
     """Главная функция приложения"""
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
 
-    # Простая настройка палитры без лишних стилей
-    app.setStyleSheet("""
-        QMainWindow {
-            background: white;
-        }
-        QWidget {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            font-size: 13px;
-        }
-    """)
+    # Общий стиль приложения разбирается один раз
+    app.setStyleSheet(styles.APP_STYLE)
 
     # Создание и отображение окна
     window = MainWindow()
@@ -289,26 +289,25 @@ QPushButton:pressed {{
 """
 
 # Дроп-области
+# Состояние перетаскивания задается динамическим свойством dragActive,
+# поэтому стиль разбирается один раз, а не при каждом drag-событии.
+# objectName в селекторе нужен, чтобы правило было сильнее фона #contentWidget
 DROP_AREA_STYLE = f"""
-QWidget {{
+ModernDropArea#dropArea {{
     background-color: {COLORS['gray_50']};
     border: 2px dashed {COLORS['gray_300']};
     border-radius: {BORDER_RADIUS['lg']};
     padding: {SPACING['xl']};
 }}
-"""
 
-DROP_AREA_ACTIVE_STYLE = f"""
-QWidget {{
+ModernDropArea#dropArea[dragActive="true"] {{
     background-color: {COLORS['primary_light']};
     border: 2px dashed {COLORS['primary']};
-    border-radius: {BORDER_RADIUS['lg']};
-    padding: {SPACING['xl']};
 }}
 """
 
 DROP_AREA_LABEL = f"""
-QLabel {{
+ModernDropArea QLabel#dropAreaLabel {{
     color: {COLORS['gray_600']};
     font-size: 14px;
     font-weight: 500;
@@ -317,7 +316,7 @@ QLabel {{
 """
 
 DROP_AREA_INFO = f"""
-QLabel {{
+ModernDropArea QLabel#dropAreaInfo {{
     color: {COLORS['success']};
     font-size: 13px;
     font-weight: 600;
@@ -554,4 +553,138 @@ QFrame {{
     border-radius: {BORDER_RADIUS['md']};
     padding: {SPACING['lg']};
 }}
-"""
\ No newline at end of file
+"""
+# Кнопки главного окна; одинаковые кнопки разных вкладок различаются
+# только objectName
+MAIN_BUTTONS_STYLE = """
+QPushButton#mappingButton, QPushButton#processButton {
+    color: white;
+    border: none;
+    border-radius: 6px;
+    padding: 10px;
+    font-weight: bold;
+}
+QPushButton#mappingButton {
+    background: #6c757d;
+}
+QPushButton#mappingButton:hover {
+    background: #5a6268;
+}
+QPushButton#processButton {
+    background: #28a745;
+}
+QPushButton#processButton:hover {
+    background: #218838;
+}
+QPushButton#mappingButton:disabled, QPushButton#processButton:disabled {
+    background: #ccc;
+}
+
+QPushButton#listButton {
+    background: transparent;
+    color: #666;
+    border: 1px solid #ddd;
+    border-radius: 4px;
+    padding: 6px 12px;
+    font-size: 12px;
+}
+QPushButton#listButton:hover {
+    background: #f8f9fa;
+}
+"""
+
+# Диалог пакетного маппинга
+BATCH_DIALOG_STYLE = """
+QDialog#batchMappingDialog {
+    background-color: #ffffff;
+}
+#batchMappingDialog QLabel {
+    color: #212529;
+}
+#batchMappingDialog QPushButton {
+    background-color: #0066cc;
+    color: white;
+    border: none;
+    padding: 8px 16px;
+    border-radius: 4px;
+    font-weight: 500;
+    min-width: 80px;
+}
+#batchMappingDialog QPushButton:hover {
+    background-color: #0052a3;
+}
+#batchMappingDialog QPushButton:pressed {
+    background-color: #004080;
+}
+#batchMappingDialog QPushButton:disabled {
+    background-color: #e9ecef;
+    color: #6c757d;
+}
+#batchMappingDialog QPushButton#successButton {
+    background-color: #28a745;
+}
+#batchMappingDialog QPushButton#infoButton {
+    background-color: #17a2b8;
+}
+#batchMappingDialog QPushButton#neutralButton {
+    background-color: #6c757d;
+}
+#batchMappingDialog QPushButton#dangerButton {
+    background-color: #dc3545;
+}
+#batchMappingDialog QPushButton#acceptButton {
+    background-color: #28a745;
+    min-width: 140px;
+}
+#batchMappingDialog QGroupBox {
+    font-weight: 600;
+    color: #495057;
+    border: 2px solid #e9ecef;
+    border-radius: 8px;
+    margin-top: 10px;
+    padding-top: 10px;
+}
+#batchMappingDialog QGroupBox::title {
+    subcontrol-origin: margin;
+    left: 10px;
+    padding: 0 5px 0 5px;
+    background-color: white;
+}
+#batchMappingDialog QTableView {
+    border: 1px solid #dee2e6;
+    border-radius: 8px;
+    gridline-color: #e9ecef;
+    font-size: 13px;
+    alternate-background-color: #f8f9fa;
+}
+#batchMappingDialog QHeaderView::section {
+    background-color: #f8f9fa;
+    color: #495057;
+    font-weight: 600;
+    border: none;
+    border-bottom: 1px solid #dee2e6;
+    padding: 8px;
+}
+#batchMappingDialog QTableView QLineEdit,
+#batchMappingDialog QTableView QComboBox,
+#batchMappingDialog QTableView QSpinBox {
+    padding: 4px;
+    border: 1px solid #0066cc;
+    border-radius: 4px;
+}
+"""
+
+# Стиль всего приложения: задается один раз в main(), виджеты ссылаются
+# на правила через objectName и динамические свойства
+APP_STYLE = """
+QMainWindow {
+    background: white;
+}
+QWidget {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+    font-size: 13px;
+}
+#contentWidget, #contentWidget * {
+    background: white;
+}
+""" + MAIN_BUTTONS_STYLE + DROP_AREA_STYLE + DROP_AREA_LABEL + DROP_AREA_INFO + BATCH_DIALOG_STYLE
@@ -1,6 +1,33 @@
 from functools import wraps
+from typing import List, Optional
+
+from openpyxl.utils import column_index_from_string, get_column_letter
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QStandardItem, QStandardItemModel
 from PySide6.QtWidgets import QMessageBox
 
+NO_SHEET_TEXT = "-- Не копировать --"
+
+# Последняя колонка листа Excel (XFD)
+MAX_COLUMN = 16384
+
+
+def column_index(column: str) -> Optional[int]:
+    """Номер колонки по буквам в верхнем регистре (A = 1) или None для неверного имени"""
+    if not (column.isascii() and column.isalpha()):
+        return None
+    try:
+        index = column_index_from_string(column)
+    except ValueError:  # больше трех букв
+        return None
+    return index if index <= MAX_COLUMN else None
+
+
+def column_range(start: int, end: int) -> List[str]:
+    """Буквы колонок с номерами от start до end включительно"""
+    return [get_column_letter(index) for index in range(start, end + 1)]
+
 
 def handle_errors(func):
     @wraps(func)
@@ -13,3 +40,19 @@ def handle_errors(func):
                 self.log_message(f"❌ Ошибка: {e}")
             QMessageBox.critical(self, "Ошибка", str(e))
     return wrapper
+
+
+def google_sheets_model(google_sheets: List[str], parent=None) -> QStandardItemModel:
+    """Модель пунктов выбора Google листа, общая для нескольких QComboBox.
+
+    Текст пункта показывается пользователю, имя листа хранится в UserRole.
+    """
+    model = QStandardItemModel(parent)
+    item = QStandardItem(NO_SHEET_TEXT)
+    item.setData("", Qt.ItemDataRole.UserRole)
+    model.appendRow(item)
+    for sheet in google_sheets:
+        item = QStandardItem(f"📋 {sheet}")
+        item.setData(sheet, Qt.ItemDataRole.UserRole)
+        model.appendRow(item)
+    return model
@@ -6,7 +6,17 @@ import os
 import subprocess
 import platform
 from typing import List
-from . import styles
+
+_EXCEL_EXTENSIONS = frozenset((".xlsx", ".xls"))
+
+
+def _is_excel_file(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in _EXCEL_EXTENSIONS
+
+
+def _excel_files(urls) -> List[str]:
+    """Локальные пути Excel файлов из списка QUrl"""
+    return [path for path in (u.toLocalFile() for u in urls) if _is_excel_file(path)]
 
 
 class ClickableTextEdit(QTextBrowser):
@@ -49,7 +59,12 @@ class ModernDropArea(QWidget):
         self.setFixedHeight(80)
         self.setMaximumWidth(400)
         self.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Fixed)
-        self.setStyleSheet(f"ModernDropArea {{{styles.DROP_AREA_STYLE}}}")
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
+        # Оформление задается правилами ModernDropArea в styles.APP_STYLE
+        self.setObjectName("dropArea")
+        self.setProperty("dragActive", False)
+        # Excel файлы перетаскиваемых данных, отобранные в dragEnterEvent
+        self._pending_files: List[str] = []
 
         layout = QVBoxLayout()
         layout.setContentsMargins(20, 15, 20, 15)
@@ -62,11 +77,11 @@ class ModernDropArea(QWidget):
 
         self.label = QLabel(text)
         self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.label.setStyleSheet(styles.DROP_AREA_LABEL)
+        self.label.setObjectName("dropAreaLabel")
 
         self.file_info = QLabel("")
         self.file_info.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.file_info.setStyleSheet(styles.DROP_AREA_INFO)
+        self.file_info.setObjectName("dropAreaInfo")
         self.file_info.hide()
 
         layout.addWidget(self.label)
@@ -85,19 +100,18 @@ class ModernDropArea(QWidget):
         super().mousePressEvent(event)
 
     def dragEnterEvent(self, event: QDragEnterEvent):
-        if event.mimeData().hasUrls():
-            urls = event.mimeData().urls()
-            valid_files = [u for u in urls if u.toLocalFile().lower().endswith((".xlsx", ".xls"))]
-            if valid_files:
-                event.acceptProposedAction()
-                self.setStyleSheet(f"ModernDropArea {{{styles.DROP_AREA_ACTIVE_STYLE}}}")
+        self._pending_files = _excel_files(event.mimeData().urls()) if event.mimeData().hasUrls() else []
+        if self._pending_files:
+            event.acceptProposedAction()
+            self._set_drag_active(True)
 
     def dragLeaveEvent(self, event):
-        self.setStyleSheet(f"ModernDropArea {{{styles.DROP_AREA_STYLE}}}")
+        self._pending_files = []
+        self._set_drag_active(False)
 
     def dropEvent(self, event: QDropEvent):
-        files = [u.toLocalFile() for u in event.mimeData().urls()
-                 if u.toLocalFile().lower().endswith((".xlsx", ".xls"))]
+        # Список уже отобран при входе перетаскивания в область
+        files, self._pending_files = self._pending_files, []
         if files:
             if self.accept_multiple:
                 self.files_dropped.emit(files)
@@ -105,7 +119,16 @@ class ModernDropArea(QWidget):
             else:
                 self.file_dropped.emit(files[0])
                 self.update_file_info(files[0])
-        self.setStyleSheet(f"ModernDropArea {{{styles.DROP_AREA_STYLE}}}")
+        self._set_drag_active(False)
+
+    def _set_drag_active(self, active: bool):
+        if self.property("dragActive") == active:
+            return
+        self.setProperty("dragActive", active)
+        # Пересчет правил по новому значению свойства без разбора QSS
+        self.style().unpolish(self)
+        self.style().polish(self)
+        self.update()
 
     def open_file_dialog(self):
         if self.accept_multiple: